@@ -0,0 +1,25 @@
+"""add (owner_id, id) index on item for keyset pagination
+
+Revision ID: 3f9b1c2d8e47
+Revises: adc957fe03c3
+Create Date: 2026-10-18 09:12:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9b1c2d8e47'
+down_revision = 'adc957fe03c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_item_owner_id_id', 'item', ['owner_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_item_owner_id_id', table_name='item')
@@ -0,0 +1,36 @@
+"""add generated search_vector column and GIN index on course
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f9b1c2d8e47
+Create Date: 2026-10-18 11:03:27.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a93'
+down_revision = '3f9b1c2d8e47'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.models.COURSE_SEARCH_VECTOR at this revision
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(course_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(categories::text, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(syllabus, '')), 'C')"
+)
+
+
+def upgrade():
+    op.add_column('course', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+    op.create_index('ix_course_search_vector', 'course', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_course_search_vector', table_name='course', postgresql_using='gin')
+    op.drop_column('course', 'search_vector')
@@ -0,0 +1,33 @@
+"""add ratelimitbucket table
+
+Revision ID: a3c5e7f9b1d4
+Revises: f1b3d5e7a9c2
+Create Date: 2026-10-18 17:20:41.260518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e7f9b1d4'
+down_revision = 'f1b3d5e7a9c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Unlogged: buckets are cheap to lose on a crash and written on every login
+    op.create_table('ratelimitbucket',
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('allowed', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('key'),
+    prefixes=['UNLOGGED']
+    )
+
+
+def downgrade():
+    op.drop_table('ratelimitbucket')
@@ -0,0 +1,32 @@
+"""clear sent outboundemail content
+
+Revision ID: b8d0f2a4c6e9
+Revises: d6e8f0a2c4b7
+Create Date: 2026-10-18 21:14:36.208417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d0f2a4c6e9'
+down_revision = 'd6e8f0a2c4b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column('outboundemail', 'html_content',
+               existing_type=sa.TEXT(),
+               nullable=True)
+    # Bodies of delivered and abandoned emails can hold reset links, drop them
+    op.execute("UPDATE outboundemail SET html_content = NULL WHERE status <> 'pending'")
+
+
+def downgrade():
+    op.execute("UPDATE outboundemail SET html_content = '' WHERE html_content IS NULL")
+    op.alter_column('outboundemail', 'html_content',
+               existing_type=sa.TEXT(),
+               nullable=False)
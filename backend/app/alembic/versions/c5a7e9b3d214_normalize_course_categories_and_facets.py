@@ -0,0 +1,169 @@
+"""categories as JSONB with GIN index, trigger-maintained course facet counts
+
+Revision ID: c5a7e9b3d214
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-18 13:41:09.226187
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a7e9b3d214'
+down_revision = '8b2e4d6f1a93'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.models.COURSE_SEARCH_VECTOR at this revision
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(course_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(categories::text, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(syllabus, '')), 'C')"
+)
+
+# coursefacet holds one row per (course, facet, value) and is kept in sync from
+# course and price by triggers; its own trigger keeps coursefacetcount exact.
+FACET_FUNCTIONS = """
+CREATE FUNCTION coursefacet_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO coursefacetcount (facet, value, count)
+        VALUES (NEW.facet, NEW.value, 1)
+        ON CONFLICT (facet, value) DO UPDATE SET count = coursefacetcount.count + 1;
+        RETURN NEW;
+    END IF;
+    UPDATE coursefacetcount SET count = count - 1
+    WHERE facet = OLD.facet AND value = OLD.value;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION course_price_band(amount numeric) RETURNS text AS $$
+    SELECT CASE
+        WHEN amount < 20 THEN 'under_20'
+        WHEN amount < 50 THEN '20_50'
+        WHEN amount < 100 THEN '50_100'
+        ELSE '100_plus'
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE FUNCTION sync_course_attribute_facets(course_row course) RETURNS void AS $$
+BEGIN
+    DELETE FROM coursefacet
+    WHERE course_id = course_row.id AND facet IN ('category', 'level');
+    INSERT INTO coursefacet (course_id, facet, value)
+    SELECT DISTINCT course_row.id, 'category', left(category, 128)
+    FROM jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(course_row.categories) = 'array'
+        THEN course_row.categories ELSE '[]'::jsonb END
+    ) AS category
+    UNION
+    SELECT course_row.id, 'level', left(course_row.level, 128)
+    WHERE course_row.level IS NOT NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION sync_course_price_facets(affected_course_id uuid) RETURNS void AS $$
+BEGIN
+    DELETE FROM coursefacet
+    WHERE course_id = affected_course_id AND facet = 'price_band';
+    INSERT INTO coursefacet (course_id, facet, value)
+    SELECT DISTINCT course_id, 'price_band', course_price_band(amount)
+    FROM price
+    WHERE course_id = affected_course_id
+    AND EXISTS (SELECT 1 FROM course WHERE id = affected_course_id);
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION course_facets_sync() RETURNS trigger AS $$
+BEGIN
+    PERFORM sync_course_attribute_facets(NEW);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION price_facets_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM sync_course_price_facets(OLD.course_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM sync_course_price_facets(NEW.course_id);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER coursefacet_count AFTER INSERT OR DELETE ON coursefacet
+FOR EACH ROW EXECUTE FUNCTION coursefacet_count();
+
+CREATE TRIGGER course_facets_sync AFTER INSERT OR UPDATE OF categories, level ON course
+FOR EACH ROW EXECUTE FUNCTION course_facets_sync();
+
+CREATE TRIGGER price_facets_sync AFTER INSERT OR UPDATE OR DELETE ON price
+FOR EACH ROW EXECUTE FUNCTION price_facets_sync();
+"""
+
+
+def upgrade():
+    # search_vector is generated from categories, Postgres won't retype it underneath
+    op.drop_index('ix_course_search_vector', table_name='course', postgresql_using='gin')
+    op.drop_column('course', 'search_vector')
+    op.alter_column('course', 'categories',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='categories::jsonb')
+    op.add_column('course', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+    op.create_index('ix_course_search_vector', 'course', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_course_categories', 'course', ['categories'], unique=False, postgresql_using='gin', postgresql_ops={'categories': 'jsonb_path_ops'})
+
+    op.create_table('coursefacet',
+    sa.Column('course_id', sa.Uuid(), nullable=False),
+    sa.Column('facet', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('value', sqlmodel.sql.sqltypes.AutoString(length=128), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['course.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'facet', 'value')
+    )
+    op.create_index('ix_coursefacet_facet_value', 'coursefacet', ['facet', 'value'], unique=False)
+    op.create_table('coursefacetcount',
+    sa.Column('facet', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('value', sqlmodel.sql.sqltypes.AutoString(length=128), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value')
+    )
+    op.execute(FACET_FUNCTIONS)
+
+    # Backfill, the coursefacet trigger fills in the counts as rows arrive
+    op.execute("SELECT sync_course_attribute_facets(course) FROM course")
+    op.execute("SELECT sync_course_price_facets(id) FROM course WHERE id IN (SELECT course_id FROM price)")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER price_facets_sync ON price")
+    op.execute("DROP TRIGGER course_facets_sync ON course")
+    op.execute("DROP TRIGGER coursefacet_count ON coursefacet")
+    op.execute("DROP FUNCTION price_facets_sync()")
+    op.execute("DROP FUNCTION course_facets_sync()")
+    op.execute("DROP FUNCTION sync_course_price_facets(uuid)")
+    op.execute("DROP FUNCTION sync_course_attribute_facets(course)")
+    op.execute("DROP FUNCTION course_price_band(numeric)")
+    op.execute("DROP FUNCTION coursefacet_count()")
+    op.drop_table('coursefacetcount')
+    op.drop_index('ix_coursefacet_facet_value', table_name='coursefacet')
+    op.drop_table('coursefacet')
+
+    op.drop_index('ix_course_categories', table_name='course', postgresql_using='gin')
+    op.drop_index('ix_course_search_vector', table_name='course', postgresql_using='gin')
+    op.drop_column('course', 'search_vector')
+    op.alter_column('course', 'categories',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.JSON(),
+               existing_nullable=True,
+               postgresql_using='categories::json')
+    op.add_column('course', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+    op.create_index('ix_course_search_vector', 'course', ['search_vector'], unique=False, postgresql_using='gin')
@@ -0,0 +1,36 @@
+"""hash userprofile passwords
+
+Revision ID: d6e8f0a2c4b7
+Revises: a3c5e7f9b1d4
+Create Date: 2026-10-18 18:02:17.554902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6e8f0a2c4b7'
+down_revision = 'a3c5e7f9b1d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing plaintext rows are hashed in batches by the app, not here, so the
+    # migration stays short and doesn't hold a lock on every profile
+    op.add_column('userprofile', sa.Column('hashed_password', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+    op.alter_column('userprofile', 'password',
+               existing_type=sa.VARCHAR(length=32),
+               nullable=True)
+    op.create_index('ix_userprofile_unhashed', 'userprofile', ['id'], unique=False, postgresql_where=sa.text('hashed_password IS NULL'))
+
+
+def downgrade():
+    # Only possible while no profile has been hashed, plaintext can't be restored
+    op.drop_index('ix_userprofile_unhashed', table_name='userprofile', postgresql_where=sa.text('hashed_password IS NULL'))
+    op.alter_column('userprofile', 'password',
+               existing_type=sa.VARCHAR(length=32),
+               nullable=False)
+    op.drop_column('userprofile', 'hashed_password')
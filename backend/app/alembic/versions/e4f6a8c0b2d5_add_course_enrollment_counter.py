@@ -0,0 +1,37 @@
+"""add sharded courseenrollmentcounter table
+
+Revision ID: e4f6a8c0b2d5
+Revises: c5a7e9b3d214
+Create Date: 2026-10-18 14:22:51.603318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4f6a8c0b2d5'
+down_revision = 'c5a7e9b3d214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('courseenrollmentcounter',
+    sa.Column('course_id', sa.Uuid(), nullable=False),
+    sa.Column('slot', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['course.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'slot')
+    )
+
+
+def downgrade():
+    # Keep increments that haven't been folded yet
+    op.execute(
+        "UPDATE course SET enrollment_count = course.enrollment_count + totals.total "
+        "FROM (SELECT course_id, sum(count) AS total FROM courseenrollmentcounter "
+        "GROUP BY course_id) AS totals WHERE course.id = totals.course_id"
+    )
+    op.drop_table('courseenrollmentcounter')
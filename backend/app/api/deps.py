@@ -1,16 +1,27 @@
-from collections.abc import Generator
+import time
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
+from sqlalchemy import event
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import (
+    async_engine,
+    async_replica_engines,
+    engine,
+    replica_engines,
+    replica_router,
+)
+from app.core.replicas import LAST_WRITE_COOKIE, LAST_WRITE_STATE
 from app.models import TokenPayload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -18,16 +29,73 @@ reusable_oauth2 = OAuth2PasswordBearer(
 )
 
 
-def get_db() -> Generator[Session, None, None]:
+def last_write(request: Request) -> float | None:
+    """
+    When the client last wrote, from this request or its last write cookie.
+    """
+    written_at: float | None = getattr(request.state, LAST_WRITE_STATE, None)
+    if written_at is not None:
+        return written_at
+    try:
+        return float(request.cookies[LAST_WRITE_COOKIE])
+    except (KeyError, ValueError):
+        return None
+
+
+def _track_writes(session: Session, request: Request) -> None:
+    if not replica_router.enabled:
+        return
+
+    def mark_write(_session: Session) -> None:
+        # LastWriteMiddleware turns it into the response's cookie
+        setattr(request.state, LAST_WRITE_STATE, time.time())
+
+    event.listen(session, "after_commit", mark_write)
+
+
+def get_db(request: Request) -> Generator[Session, None, None]:
     with Session(engine) as session:
+        _track_writes(session, request)
+        yield session
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # Objects must stay readable after commit, lazy refreshes can't run in async
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        _track_writes(session.sync_session, request)
+        yield session
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    if replica_router.check_due:
+        replica_router.refresh_health()
+    index = replica_router.choose(last_write(request))
+    read_engine = engine if index is None else replica_engines[index]
+    with Session(read_engine) as session:
+        yield session
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if replica_router.check_due:
+        await run_in_threadpool(replica_router.refresh_health)
+    index = replica_router.choose(last_write(request))
+    read_engine = async_engine if index is None else async_replica_engines[index]
+    async with AsyncSession(read_engine, expire_on_commit=False) as session:
         yield session
 
 
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
+# Read-only work that tolerates replica lag, never write through these
+ReadSessionDep = Annotated[Session, Depends(get_read_db)]
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def decode_token(token: str) -> TokenPayload:
+    cached = security.token_cache.get(token)
+    if cached and cached[1] > time.time():
+        return cached[0]
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -38,7 +106,11 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+    security.token_cache.set(token, (token_data, float(payload.get("exp", 0))))
+    return token_data
+
+
+def check_user(user: User | None) -> User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
@@ -46,7 +118,50 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
     return user
 
 
+# Requests that may be served from the cached user, writes always load the row
+CACHED_USER_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _cached_user(request: Request, user_id: str | None) -> User | None:
+    if request.method not in CACHED_USER_METHODS:
+        # Another worker may have deactivated or deleted the user since caching
+        return None
+    return security.user_cache.get(user_id)
+
+
+def get_current_user(request: Request, session: SessionDep, token: TokenDep) -> User:
+    token_data = decode_token(token)
+    cached = _cached_user(request, token_data.sub)
+    if cached:
+        # Copy the snapshot into this session without a query, reads don't flush it
+        return check_user(session.merge(cached, load=False))
+    user = session.get(User, token_data.sub)
+    if not user:
+        security.invalidate_user(str(token_data.sub))
+        return check_user(user)
+    session.expunge(user)
+    security.user_cache.set(token_data.sub, user)
+    return check_user(session.merge(user, load=False))
+
+
+async def get_current_user_async(
+    request: Request, session: AsyncSessionDep, token: TokenDep
+) -> User:
+    token_data = decode_token(token)
+    cached = _cached_user(request, token_data.sub)
+    if cached:
+        return check_user(await session.merge(cached, load=False))
+    user = await session.get(User, token_data.sub)
+    if not user:
+        security.invalidate_user(str(token_data.sub))
+        return check_user(user)
+    session.expunge(user)
+    security.user_cache.set(token_data.sub, user)
+    return check_user(await session.merge(user, load=False))
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
+AsyncCurrentUser = Annotated[User, Depends(get_current_user_async)]
 
 
 def get_current_active_superuser(current_user: CurrentUser) -> User:
@@ -55,3 +170,11 @@ def get_current_active_superuser(current_user: CurrentUser) -> User:
             status_code=403, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+async def get_current_active_superuser_async(current_user: AsyncCurrentUser) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403, detail="The user doesn't have enough privileges"
+        )
+    return current_user
@@ -0,0 +1,44 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic_core import to_json
+
+
+def make_etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison against an If-None-Match header, as required for GET.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def etag_response(request: Request, content: Any, *, private: bool = True) -> Response:
+    """
+    JSON response tagged with a weak ETag of its body, or an empty 304 when the
+    client's If-None-Match already names that body.
+
+    content must already be the response model, FastAPI doesn't validate a
+    returned Response.
+    """
+    body = to_json(content)
+    etag = make_etag(body)
+    headers = {
+        "ETag": etag,
+        # Let clients keep the body but revalidate before every reuse
+        "Cache-Control": "private, no-cache" if private else "no-cache",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,6 +1,15 @@
 from fastapi import APIRouter
 
-from app.api.routes import items, login, users, utils, user_profile, contact_us
+from app.api.routes import (
+    contact_us,
+    courses,
+    enrollments,
+    items,
+    login,
+    user_profile,
+    users,
+    utils,
+)
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
@@ -9,3 +18,7 @@ api_router.include_router(utils.router, prefix="/utils", tags=["utils"])
 api_router.include_router(items.router, prefix="/items", tags=["items"])
 api_router.include_router(user_profile.router, prefix="/user_profile", tags=["signup"])
 api_router.include_router(contact_us.router, prefix="/contactus", tags=["contactus"])
+api_router.include_router(courses.router, prefix="/courses", tags=["courses"])
+api_router.include_router(
+    enrollments.router, prefix="/enrollments", tags=["enrollments"]
+)
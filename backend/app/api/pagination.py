@@ -0,0 +1,27 @@
+import base64
+import binascii
+import uuid
+from collections.abc import Sequence
+
+from fastapi import HTTPException
+
+
+def encode_cursor(last_id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(last_id.bytes).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> uuid.UUID:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return uuid.UUID(bytes=base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def next_cursor(rows: Sequence[object], limit: int) -> str | None:
+    """
+    Cursor after the last row of a full page, None when there is nothing more.
+    """
+    if limit <= 0 or len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1].id)  # type: ignore[attr-defined]
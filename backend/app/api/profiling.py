@@ -0,0 +1,94 @@
+from fastapi import HTTPException
+from fastapi.security.utils import get_authorization_scheme_param
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.deps import decode_token
+from app.core import security
+from app.core.config import settings
+from app.core.db import engine
+from app.core.metrics import route_name
+from app.core.profiling import StackSampler, new_profile_id, save_profile
+from app.models import User
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+def profiling_requested(scope: Scope) -> bool:
+    if Headers(scope=scope).get(PROFILE_HEADER):
+        return True
+    query_string = scope.get("query_string", b"").decode("latin-1")
+    return bool(QueryParams(query_string).get(PROFILE_QUERY_PARAM))
+
+
+def _load_user(user_id: str) -> User | None:
+    with Session(engine) as session:
+        return session.get(User, user_id)
+
+
+async def is_superuser(scope: Scope) -> bool:
+    """
+    Whether the request's bearer token belongs to an active superuser.
+    """
+    authorization = Headers(scope=scope).get("Authorization")
+    scheme, token = get_authorization_scheme_param(authorization)
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        token_data = decode_token(token)
+    except HTTPException:
+        return False
+    if token_data.sub is None:
+        return False
+    user = security.user_cache.get(token_data.sub)
+    if user is None:
+        user = await run_in_threadpool(_load_user, token_data.sub)
+    return bool(user and user.is_active and user.is_superuser)
+
+
+class ProfilingMiddleware:
+    """
+    Sample the stacks of a request when a superuser asks with the X-Profile
+    header or a _profile query parameter, and PROFILING_ENABLED is set.
+
+    The profile goes to PROFILING_DIR and its id comes back in X-Profile-Id,
+    fetch it from /utils/profiles/{id}. Requests that don't ask only pay for a
+    header lookup, and nothing at all when profiling is off.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.PROFILING_ENABLED
+            or not profiling_requested(scope)
+            or not await is_superuser(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(interval=settings.PROFILING_SAMPLE_INTERVAL)
+        profile_id = ""
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal profile_id
+            if message["type"] == "http.response.start":
+                # The route is matched by now, name the profile after it
+                profile_id = new_profile_id(route_name(scope))
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            # Stopped after the last body chunk, so streamed responses count too
+            sampler.stop()
+            if profile_id:
+                await run_in_threadpool(save_profile, sampler, profile_id)
@@ -0,0 +1,21 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by pydantic-core's serializer instead of the json module.
+
+    Compact UTF-8 JSON like JSONResponse, produced several times faster on large
+    pages. UUIDs, datetimes, Decimals and models are serialized directly, and
+    NaN and infinite floats become null where JSONResponse refuses them.
+
+    Routes can return one wrapping their response model to skip response_model
+    validation and jsonable_encoder as well, the model's own serializer then
+    decides the output.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, inf_nan_mode="null")
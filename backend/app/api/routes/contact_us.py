@@ -1,58 +1,80 @@
-from typing import List
+from collections.abc import Iterator
 
-from fastapi import APIRouter
-from fastapi import HTTPException, status
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Engine
+from sqlmodel import Session
 
-
-from fastapi.responses import JSONResponse
-
-
-from app.api.deps import SessionDep
-from app.crud.user_item_crud import create_contact_message, get_contact_messages
+from app.api.deps import ReadSessionDep, SessionDep
+from app.api.responses import PydanticJSONResponse
 from app.crud import user_profile_crud
+from app.crud.user_item_crud import (
+    contact_messages_with_profiles_statement,
+    create_contact_message,
+    get_contact_messages_with_profiles,
+)
 from app.models import ContactMessage
-from app.schemas.contactus import ContactMessageRequest, ContactMessageResponse
+from app.schemas.contactus import (
+    ContactMessageRequest,
+    ContactMessageResponse,
+    to_contact_message_res,
+)
 
 router = APIRouter()
 
+# Rows fetched per round trip through the server-side cursor, and per chunk sent
+STREAM_BATCH_SIZE = 500
+
 
 @router.post("/contact_us", response_model=ContactMessageResponse)
-def send_message(session: SessionDep, contact_req: ContactMessageRequest):
+def send_message(
+    session: SessionDep, contact_req: ContactMessageRequest
+) -> PydanticJSONResponse:
     new_msg_record = ContactMessage()
     new_msg_record.message = contact_req.message
     user_profile = user_profile_crud.get_user_profile_by_email(
-        session=session,
-        email=contact_req.email
+        session=session, email=contact_req.email
     )
     if not user_profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found for given email ID"
+            detail="User not found for given email ID",
         )
     new_msg_record.user_profile_id = user_profile.id
-    new_msg_record = create_contact_message(session=session, contact_message=new_msg_record)
-    return JSONResponse(
+    new_msg_record = create_contact_message(
+        session=session, contact_message=new_msg_record
+    )
+    return PydanticJSONResponse(
         status_code=status.HTTP_200_OK,
-        content="Thank you for sharing the feedback with us"
+        content="Thank you for sharing the feedback with us",
     )
 
 
-@router.get("/", response_model=List[ContactMessageResponse])
-def get_by_contact_message(session: SessionDep):
-    messages = get_contact_messages(session=session)
-    response_messages = []
-    for msg in messages:
-        user_id = msg.user_profile_id
-        user_profile = user_profile_crud.get_user_profile_by_id(
-            session=session, id=user_id
-        )
-        response_messages.append(
-            ContactMessageResponse(
-                first_name=user_profile.full_name,
-                last_name=user_profile.last_name,
-                email=user_profile.email,
-                phone_number=user_profile.phone_number,
-                message=msg.message
-            )
+@router.get("/", response_model=list[ContactMessageResponse])
+def get_by_contact_message(
+    session: ReadSessionDep, skip: int = 0, limit: int = 100, stream: bool = False
+) -> StreamingResponse | list[ContactMessageResponse]:
+    if stream:
+        # The request's session closes before the body is sent, stream from our own
+        bind = session.get_bind()
+        return StreamingResponse(
+            _stream_contact_messages(bind, skip=skip, limit=limit),  # type: ignore[arg-type]
+            media_type="application/json",
         )
-    return response_messages
+    rows = get_contact_messages_with_profiles(session=session, skip=skip, limit=limit)
+    return [to_contact_message_res(msg, user_profile) for msg, user_profile in rows]
+
+
+def _stream_contact_messages(bind: Engine, skip: int, limit: int) -> Iterator[str]:
+    statement = contact_messages_with_profiles_statement(skip=skip, limit=limit)
+    yield "["
+    chunk: list[str] = []
+    with Session(bind) as session:
+        rows = session.exec(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+        for index, (msg, user_profile) in enumerate(rows):
+            message = to_contact_message_res(msg, user_profile).model_dump_json()
+            chunk.append("," + message if index else message)
+            if len(chunk) == STREAM_BATCH_SIZE:
+                yield "".join(chunk)
+                chunk.clear()
+    yield "".join(chunk) + "]"
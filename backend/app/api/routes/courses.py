@@ -0,0 +1,150 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import (
+    AsyncReadSessionDep,
+    AsyncSessionDep,
+    get_current_active_superuser_async,
+)
+from app.api.etag import etag_response
+from app.api.pagination import decode_cursor, next_cursor
+from app.core.config import settings
+from app.crud import async_course_crud
+from app.models import Message
+from app.schemas.course import (
+    CourseAnnouncementReq,
+    CourseDetailRes,
+    CourseFacetsRes,
+    CourseSearchRes,
+    CoursesRes,
+    EnrollmentCountRes,
+    to_course_detail_res,
+    to_course_facets_res,
+    to_course_search_hit_res,
+    to_course_summary_res,
+)
+from app.utils import generate_course_announcement_emails, send_emails
+
+router = APIRouter()
+
+
+@router.get("/", response_model=CoursesRes)
+async def read_courses(
+    session: AsyncReadSessionDep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    include_count: bool = True,
+    category: list[str] = Query(default=[]),
+    level: str | None = None,
+    price_band: str | None = None,
+) -> CoursesRes:
+    after = decode_cursor(cursor) if cursor else None
+    filters = async_course_crud.course_filters(
+        categories=category, level=level, price_band=price_band
+    )
+    count = None
+    if include_count:
+        count = await async_course_crud.count_courses(session=session, filters=filters)
+    courses = await async_course_crud.get_courses(
+        session=session, skip=skip, limit=limit, after=after, filters=filters
+    )
+    return CoursesRes(
+        data=[to_course_summary_res(course) for course in courses],
+        count=count,
+        next_cursor=next_cursor(courses, limit),
+    )
+
+
+# Declared before /{id} so "search" isn't parsed as a course id
+@router.get("/search", response_model=CourseSearchRes)
+async def search_courses(
+    session: AsyncReadSessionDep,
+    q: str = Query(min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = Query(default=20, le=100),
+) -> CourseSearchRes:
+    hits = await async_course_crud.search_courses(
+        session=session, q=q, skip=skip, limit=limit
+    )
+    return CourseSearchRes(
+        data=[to_course_search_hit_res(course, rank) for course, rank in hits]
+    )
+
+
+@router.get("/facets", response_model=CourseFacetsRes)
+async def read_course_facets(session: AsyncReadSessionDep) -> CourseFacetsRes:
+    facets = await async_course_crud.get_facet_counts(session=session)
+    return to_course_facets_res(facets)
+
+
+@router.get("/{id}", response_model=CourseDetailRes)
+async def read_course(
+    request: Request, session: AsyncReadSessionDep, id: uuid.UUID
+) -> Response:
+    course = await async_course_crud.get_course_detail(session=session, id=id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    return etag_response(request, to_course_detail_res(course), private=False)
+
+
+@router.get(
+    "/{id}/enrollment-count",
+    dependencies=[Depends(get_current_active_superuser_async)],
+    response_model=EnrollmentCountRes,
+)
+async def read_course_enrollment_count(
+    session: AsyncSessionDep, id: uuid.UUID
+) -> EnrollmentCountRes:
+    """
+    Exact enrollment count, including increments not yet folded into the course.
+    """
+    counts = await async_course_crud.get_enrollment_counts(session=session, id=id)
+    if counts is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    folded, pending = counts
+    return EnrollmentCountRes(
+        course_id=id, folded=folded, pending=pending, exact=folded + pending
+    )
+
+
+@router.post(
+    "/{id}/announcements",
+    dependencies=[Depends(get_current_active_superuser_async)],
+    status_code=201,
+)
+async def announce_course(
+    session: AsyncSessionDep, id: uuid.UUID, announcement: CourseAnnouncementReq
+) -> Message:
+    """
+    Email an announcement to every learner enrolled in the course.
+
+    The emails are rendered from one template and queued in a single insert, the
+    background sender delivers them in batches over its pooled SMTP session.
+    """
+    if not settings.emails_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Emails are not configured",
+        )
+    course_name = await async_course_crud.get_course_name(session=session, id=id)
+    if course_name is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    learners = await async_course_crud.get_enrolled_learners(session=session, id=id)
+    messages = await run_in_threadpool(
+        generate_course_announcement_emails,
+        course_name=course_name,
+        learners=learners,
+        subject=announcement.subject,
+        message=announcement.message,
+    )
+    queued = await run_in_threadpool(send_emails, messages)
+    return Message(message=f"Queued {queued} emails")
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlmodel import col
+
+from app.api.deps import ReadSessionDep, SessionDep, get_current_active_superuser
+from app.api.export import ExportFormat, export_response, export_statement
+from app.crud import enrollment_crud
+from app.models import UserEnrollment
+from app.schemas.enrollment import (
+    BulkEnrollmentRequest,
+    BulkEnrollmentResponse,
+    EnrollmentRes,
+    to_bulk_enrollment_res,
+)
+
+router = APIRouter()
+
+
+@router.post(
+    "/bulk",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=BulkEnrollmentResponse,
+)
+def bulk_enroll(
+    session: SessionDep, bulk_req: BulkEnrollmentRequest
+) -> BulkEnrollmentResponse:
+    """
+    Enroll many users at once, reporting an outcome for every pair.
+
+    Pairs that fail validation or are already enrolled don't fail the request.
+    """
+    outcomes = enrollment_crud.bulk_enroll(
+        session=session,
+        pairs=[(item.user_id, item.course_id) for item in bulk_req.items],
+        status=bulk_req.status,
+    )
+    return to_bulk_enrollment_res(bulk_req.items, outcomes)
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=StreamingResponse,
+)
+def export_enrollments(
+    session: ReadSessionDep, format: ExportFormat = "ndjson"
+) -> StreamingResponse:
+    """
+    Stream every enrollment as NDJSON or CSV.
+    """
+    statement = export_statement(UserEnrollment, EnrollmentRes).order_by(
+        col(UserEnrollment.course_id), col(UserEnrollment.user_id)
+    )
+    return export_response(
+        session, statement, EnrollmentRes, format=format, filename="enrollments"
+    )
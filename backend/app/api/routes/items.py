@@ -1,57 +1,164 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, col
 
-from app.api.deps import CurrentUser, SessionDep
-from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncReadSessionDep,
+    CurrentUser,
+    ReadSessionDep,
+    SessionDep,
+)
+from app.api.etag import etag_response
+from app.api.export import ExportFormat, export_response, export_statement
+from app.api.pagination import decode_cursor, next_cursor
+from app.api.responses import PydanticJSONResponse
+from app.crud import async_user_item_crud, user_item_crud
+from app.models import (
+    Item,
+    ItemCreate,
+    ItemPublic,
+    ItemsBulkCreate,
+    ItemsBulkDelete,
+    ItemsBulkUpdate,
+    ItemsPublic,
+    ItemUpdate,
+    Message,
+    User,
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=ItemsPublic)
-def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_items(
+    session: AsyncReadSessionDep,
+    current_user: AsyncCurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    include_count: bool = True,
 ) -> Any:
     """
     Retrieve items.
+
+    Pass the previous page's next_cursor as cursor to page without an offset scan.
     """
 
-    if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Item)
-        count = session.exec(count_statement).one()
-        statement = select(Item).offset(skip).limit(limit)
-        items = session.exec(statement).all()
-    else:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.owner_id == current_user.id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Item)
-            .where(Item.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
+    owner_id = None if current_user.is_superuser else current_user.id
+    after = decode_cursor(cursor) if cursor else None
+    count = None
+    if include_count:
+        count = await async_user_item_crud.count_items(
+            session=session, owner_id=owner_id
         )
-        items = session.exec(statement).all()
+    items = await async_user_item_crud.get_items(
+        session=session, owner_id=owner_id, skip=skip, limit=limit, after=after
+    )
+
+    # Already an ItemsPublic, serialize it without revalidating every row
+    return PydanticJSONResponse(
+        ItemsPublic(data=items, count=count, next_cursor=next_cursor(items, limit))
+    )
 
-    return ItemsPublic(data=items, count=count)
+
+# Declared before /{id} so "export" and "bulk" aren't parsed as item ids
+@router.get("/export", response_class=StreamingResponse)
+def export_items(
+    session: ReadSessionDep, current_user: CurrentUser, format: ExportFormat = "ndjson"
+) -> Any:
+    """
+    Stream every item visible to the user as NDJSON or CSV.
+    """
+    statement = export_statement(Item, ItemPublic).order_by(col(Item.id))
+    if not current_user.is_superuser:
+        statement = statement.where(Item.owner_id == current_user.id)
+    return export_response(
+        session, statement, ItemPublic, format=format, filename="items"
+    )
+
+
+def check_items_permissions(
+    session: Session, current_user: User, ids: list[uuid.UUID]
+) -> None:
+    """
+    One lookup for a whole bulk request, any missing or foreign item fails it.
+    """
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Duplicate item ids")
+    owners = user_item_crud.get_item_owners(session=session, ids=ids)
+    missing = [id for id in ids if id not in owners]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Item {missing[0]} not found")
+    if not current_user.is_superuser and any(
+        owner_id != current_user.id for owner_id in owners.values()
+    ):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+
+@router.post("/bulk", response_model=ItemsPublic)
+def create_items(
+    *, session: SessionDep, current_user: CurrentUser, items_in: ItemsBulkCreate
+) -> Any:
+    """
+    Create many items in one transaction.
+    """
+    items = user_item_crud.create_items(
+        session=session, items_in=items_in.data, owner_id=current_user.id
+    )
+    # Serialize before commit expires the returned rows
+    result = ItemsPublic(data=items, count=len(items))
+    session.commit()
+    return result
+
+
+@router.put("/bulk", response_model=ItemsPublic)
+def update_items(
+    *, session: SessionDep, current_user: CurrentUser, items_in: ItemsBulkUpdate
+) -> Any:
+    """
+    Update many items in one transaction, fields left out are unchanged.
+    """
+    check_items_permissions(
+        session, current_user, [item_in.id for item_in in items_in.data]
+    )
+    items = user_item_crud.update_items(session=session, items_in=items_in.data)
+    result = ItemsPublic(data=items, count=len(items))
+    session.commit()
+    return result
+
+
+@router.delete("/bulk")
+def delete_items(
+    *, session: SessionDep, current_user: CurrentUser, items_in: ItemsBulkDelete
+) -> Message:
+    """
+    Delete many items in one transaction.
+    """
+    check_items_permissions(session, current_user, items_in.ids)
+    deleted = user_item_crud.delete_items(session=session, ids=items_in.ids)
+    session.commit()
+    return Message(message=f"{deleted} items deleted successfully")
 
 
 @router.get("/{id}", response_model=ItemPublic)
-def read_item(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_item(
+    request: Request, session: ReadSessionDep, current_user: CurrentUser, id: uuid.UUID
+) -> Any:
     """
     Get item by ID.
+
+    Answers 304 when If-None-Match carries the item's current ETag.
     """
     item = session.get(Item, id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     if not current_user.is_superuser and (item.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return item
+    return etag_response(request, ItemPublic.model_validate(item))
 
 
 @router.post("/", response_model=ItemPublic)
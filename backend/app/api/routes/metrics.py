@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from app.api.deps import get_current_active_superuser
+from app.core import metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    dependencies=[Depends(get_current_active_superuser)],
+    include_in_schema=False,
+)
+def read_metrics() -> Response:
+    """
+    Prometheus metrics of every worker, for a scraper holding a superuser token.
+    """
+    if not metrics.enabled():
+        raise HTTPException(status_code=404, detail="Metrics are not enabled")
+    content, media_type = metrics.render_latest()
+    return Response(content=content, media_type=media_type)
@@ -1,17 +1,33 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlmodel import col, delete
+from starlette.concurrency import run_in_threadpool
 
 from app import crud
 from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncReadSessionDep,
+    AsyncSessionDep,
     CurrentUser,
+    ReadSessionDep,
     SessionDep,
     get_current_active_superuser,
+    get_current_active_superuser_async,
 )
+from app.api.etag import etag_response
+from app.api.export import ExportFormat, export_response, export_statement
+from app.api.pagination import decode_cursor, next_cursor
+from app.api.responses import PydanticJSONResponse
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash_async,
+    invalidate_user,
+    verify_password_async,
+)
+from app.crud import async_user_item_crud
 from app.models import (
     Item,
     Message,
@@ -31,43 +47,79 @@ router = APIRouter()
 
 @router.get(
     "/",
-    dependencies=[Depends(get_current_active_superuser)],
+    dependencies=[Depends(get_current_active_superuser_async)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+async def read_users(
+    session: AsyncReadSessionDep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    include_count: bool = True,
+) -> Any:
     """
     Retrieve users.
+
+    Pass the previous page's next_cursor as cursor to page without an offset scan.
     """
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
+    after = decode_cursor(cursor) if cursor else None
+    count = None
+    if include_count:
+        count = await async_user_item_crud.count_users(session=session)
+    users = await async_user_item_crud.get_users(
+        session=session, skip=skip, limit=limit, after=after
+    )
 
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
+    # Already a UsersPublic, serialize it without revalidating every row
+    return PydanticJSONResponse(
+        UsersPublic(data=users, count=count, next_cursor=next_cursor(users, limit))
+    )
 
-    return UsersPublic(data=users, count=count)
+
+# Declared before /{user_id} so "export" isn't parsed as a user id
+@router.get(
+    "/export",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=StreamingResponse,
+)
+def export_users(session: ReadSessionDep, format: ExportFormat = "ndjson") -> Any:
+    """
+    Stream every user as NDJSON or CSV.
+    """
+    statement = export_statement(User, UserPublic).order_by(col(User.id))
+    return export_response(
+        session, statement, UserPublic, format=format, filename="users"
+    )
 
 
 @router.post(
-    "/", dependencies=[Depends(get_current_active_superuser)], response_model=UserPublic
+    "/",
+    dependencies=[Depends(get_current_active_superuser_async)],
+    response_model=UserPublic,
 )
-def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
+async def create_user(*, session: AsyncSessionDep, user_in: UserCreate) -> Any:
     """
     Create new user.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
+    user = await async_user_item_crud.get_user_by_email(
+        session=session, email=user_in.email
+    )
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
 
-    user = crud.create_user(session=session, user_create=user_in)
+    user = await async_user_item_crud.create_user(session=session, user_create=user_in)
     if settings.emails_enabled and user_in.email:
+        # The password stays out of it, queued emails are stored until sent
         email_data = generate_new_account_email(
-            email_to=user_in.email, username=user_in.email, password=user_in.password
+            email_to=user_in.email, username=user_in.email
         )
-        send_email(
+        # Queueing the email is a blocking insert, keep it off the event loop
+        await run_in_threadpool(
+            send_email,
             email_to=user_in.email,
             subject=email_data.subject,
             html_content=email_data.html_content,
@@ -94,35 +146,41 @@ def update_user_me(
     session.add(current_user)
     session.commit()
     session.refresh(current_user)
+    invalidate_user(current_user.id)
     return current_user
 
 
 @router.patch("/me/password", response_model=Message)
-def update_password_me(
-    *, session: SessionDep, body: UpdatePassword, current_user: CurrentUser
+async def update_password_me(
+    *, session: AsyncSessionDep, body: UpdatePassword, current_user: AsyncCurrentUser
 ) -> Any:
     """
     Update own password.
     """
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password_async(
+        body.current_password, current_user.hashed_password
+    ):
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = await get_password_hash_async(body.new_password)
     current_user.hashed_password = hashed_password
     session.add(current_user)
-    session.commit()
+    await session.commit()
+    invalidate_user(current_user.id)
     return Message(message="Password updated successfully")
 
 
 @router.get("/me", response_model=UserPublic)
-def read_user_me(current_user: CurrentUser) -> Any:
+def read_user_me(request: Request, current_user: CurrentUser) -> Any:
     """
     Get current user.
+
+    Answers 304 when If-None-Match carries the user's current ETag.
     """
-    return current_user
+    return etag_response(request, UserPublic.model_validate(current_user))
 
 
 @router.delete("/me", response_model=Message)
@@ -138,34 +196,40 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
     session.exec(statement)  # type: ignore
     session.delete(current_user)
     session.commit()
+    invalidate_user(current_user.id)
     return Message(message="User deleted successfully")
 
 
 @router.post("/signup", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserRegister) -> Any:
+async def register_user(session: AsyncSessionDep, user_in: UserRegister) -> Any:
     """
     Create new user without the need to be logged in.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
+    user = await async_user_item_crud.get_user_by_email(
+        session=session, email=user_in.email
+    )
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
     user_create = UserCreate.model_validate(user_in)
-    user = crud.create_user(session=session, user_create=user_create)
+    user = await async_user_item_crud.create_user(
+        session=session, user_create=user_create
+    )
     return user
 
 
 @router.get("/{user_id}", response_model=UserPublic)
 def read_user_by_id(
-    user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+    user_id: uuid.UUID, session: ReadSessionDep, current_user: CurrentUser
 ) -> Any:
     """
     Get a specific user by id.
     """
     user = session.get(User, user_id)
-    if user == current_user:
+    # Compare ids, the read session may load a different instance than current_user
+    if user and user.id == current_user.id:
         return user
     if not current_user.is_superuser:
         raise HTTPException(
@@ -225,4 +289,5 @@ def delete_user(
     session.exec(statement)  # type: ignore
     session.delete(user)
     session.commit()
+    invalidate_user(user_id)
     return Message(message="User deleted successfully")
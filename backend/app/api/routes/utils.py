@@ -1,8 +1,25 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 from pydantic.networks import EmailStr
 
-from app.api.deps import get_current_active_superuser
-from app.models import Message
+from app.api.deps import SessionDep, get_current_active_superuser
+from app.core import compression, email_queue, profiling, security
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.db import get_pools_status
+from app.crud import email_crud
+from app.models import (
+    CachesStatus,
+    CacheStatus,
+    EmailQueueStatus,
+    Message,
+    PasswordHashingStatus,
+    PoolsStatus,
+    PoolStatus,
+)
 from app.utils import generate_test_email, send_email
 
 router = APIRouter()
@@ -15,7 +32,7 @@ router = APIRouter()
 )
 def test_email(email_to: EmailStr) -> Message:
     """
-    Test emails.
+    Test emails, queued like every other outgoing email.
     """
     email_data = generate_test_email(email_to=email_to)
     send_email(
@@ -24,3 +41,88 @@ def test_email(email_to: EmailStr) -> Message:
         html_content=email_data.html_content,
     )
     return Message(message="Test email sent")
+
+
+@router.get(
+    "/db-pool/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PoolsStatus,
+)
+def read_db_pool_status() -> PoolsStatus:
+    """
+    Connection pool usage and checkout wait times for this worker.
+    """
+    return PoolsStatus(
+        data=[PoolStatus.model_validate(status) for status in get_pools_status()]
+    )
+
+
+@router.get(
+    "/caches/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=CachesStatus,
+)
+def read_caches_status() -> CachesStatus:
+    """
+    Hit and miss counters of the auth and compression caches in this worker.
+    """
+    caches: dict[str, TTLCache[Any]] = {
+        "token": security.token_cache,
+        "user": security.user_cache,
+        "compression": compression.compression_cache,
+    }
+    return CachesStatus(
+        data=[CacheStatus(name=name, **cache.stats()) for name, cache in caches.items()]
+    )
+
+
+@router.get(
+    "/password-hashing/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PasswordHashingStatus,
+)
+def read_password_hashing_status() -> PasswordHashingStatus:
+    """
+    Password hashing calls queued or running in this worker.
+    """
+    return PasswordHashingStatus(
+        executor=settings.PASSWORD_HASH_EXECUTOR,
+        concurrency=settings.PASSWORD_HASH_CONCURRENCY,
+        queue_depth=security.hash_queue_depth(),
+    )
+
+
+@router.get(
+    "/email-queue/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=EmailQueueStatus,
+)
+def read_email_queue_status(session: SessionDep) -> EmailQueueStatus:
+    """
+    Outbound email backlog, and delivery counters of this worker's sender.
+    """
+    pending, failed, oldest = email_crud.get_queue_counts(session=session)
+    oldest_pending_seconds = (
+        (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+    )
+    return EmailQueueStatus(
+        pending=pending,
+        failed=failed,
+        oldest_pending_seconds=oldest_pending_seconds,
+        **email_queue.metrics.snapshot(),
+    )
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=PlainTextResponse,
+)
+def read_profile(profile_id: str) -> PlainTextResponse:
+    """
+    Folded stacks of a profiled request, as named by its X-Profile-Id header.
+    """
+    folded = profiling.read_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
@@ -0,0 +1,221 @@
+import gzip
+import hashlib
+import zlib
+from typing import Protocol, cast
+
+import brotli  # type: ignore[import-untyped]
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Levels tuned for on-the-fly compression, not for the smallest output
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# Bodies larger than this are compressed on every request, never cached
+MAX_CACHED_BODY = 1024 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+compression_cache: TTLCache[bytes] = TTLCache(
+    maxsize=settings.COMPRESSION_CACHE_MAX_SIZE, ttl=settings.COMPRESSION_CACHE_TTL
+)
+
+
+class StreamEncoder(Protocol):
+    def chunk(self, data: bytes) -> bytes:
+        ...
+
+    def finish(self) -> bytes:
+        ...
+
+
+class GzipStream:
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        # Sync flush so clients can decode each streamed chunk as it arrives
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def chunk(self, data: bytes) -> bytes:
+        return cast(bytes, self._compressor.process(data) + self._compressor.flush())
+
+    def finish(self) -> bytes:
+        return cast(bytes, self._compressor.finish())
+
+
+class ZstdStream:
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Encodings we produce, most preferred first
+ENCODINGS = ("br", "zstd", "gzip")
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """
+    Pick the encoding with the highest q-value the client accepts, ties go to
+    the server's preference. None means send the body as is.
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name] = quality
+    candidates = [
+        (accepted[encoding], -rank, encoding)
+        for rank, encoding in enumerate(ENCODINGS)
+        if accepted.get(encoding, 0) > 0
+    ]
+    if not candidates:
+        return None
+    return max(candidates)[2]
+
+
+def compress(encoding: str, data: bytes) -> bytes:
+    if encoding == "br":
+        return cast(bytes, brotli.compress(data, quality=BROTLI_QUALITY))
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def stream_encoder(encoding: str) -> StreamEncoder:
+    if encoding == "br":
+        return BrotliStream()
+    if encoding == "zstd":
+        return ZstdStream()
+    return GzipStream()
+
+
+def compress_cached(encoding: str, data: bytes) -> bytes:
+    """
+    Compress data, reusing the result for identical bodies within the cache TTL.
+    """
+    if len(data) > MAX_CACHED_BODY or not compression_cache.enabled:
+        return compress(encoding, data)
+    key = (encoding, hashlib.blake2b(data, digest_size=16).digest())
+    compressed = compression_cache.get(key)
+    if compressed is None:
+        compressed = compress(encoding, data)
+        compression_cache.set(key, compressed)
+    return compressed
+
+
+def is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith("+json")
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with br, zstd or gzip, whichever the client prefers.
+
+    Complete bodies under COMPRESSION_MIN_SIZE are left alone. Streamed bodies
+    are compressed chunk by chunk. Compressed 200 responses to GET requests are
+    cached by content hash, so a repeated page costs a hash instead of a
+    compression.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        cacheable = scope["method"] == "GET"
+        start: Message | None = None
+        encoder: StreamEncoder | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            more_body: bool = message.get("more_body", False)
+            if encoder is not None:
+                body = encoder.chunk(body) if body else b""
+                if not more_body:
+                    body += encoder.finish()
+                await send({**message, "body": body})
+                return
+
+            assert start is not None
+            headers = MutableHeaders(scope=start)
+            headers.add_vary_header("Accept-Encoding")
+            if start["status"] in (204, 304) or not is_compressible(headers):
+                passthrough = True
+            elif not more_body and len(body) < settings.COMPRESSION_MIN_SIZE:
+                passthrough = True
+            if passthrough:
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            if more_body:
+                del headers["Content-Length"]
+                encoder = stream_encoder(encoding)
+                body = encoder.chunk(body)
+            elif cacheable and start["status"] == 200:
+                body = compress_cached(encoding, body)
+            else:
+                body = compress(encoding, body)
+            if not more_body:
+                headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
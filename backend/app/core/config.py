@@ -6,7 +6,6 @@ from pydantic import (
     AnyUrl,
     BeforeValidator,
     HttpUrl,
-    PostgresDsn,
     computed_field,
     model_validator,
 )
@@ -31,6 +30,13 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Per-worker cache of decoded tokens and current users, 0 disables it
+    AUTH_CACHE_TTL: float = 60.0
+    AUTH_CACHE_MAX_SIZE: int = 10_000
+    # bcrypt runs on its own executor so login bursts can't take every request thread
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    # Max concurrent bcrypt operations per worker, extra calls wait in a queue
+    PASSWORD_HASH_CONCURRENCY: int = 4
     DOMAIN: str = "localhost"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
@@ -56,7 +62,7 @@ class Settings(BaseSettings):
 
     @computed_field  # type: ignore[prop-decorator]
     @property
-    def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
+    def SQLALCHEMY_DATABASE_URI(self) -> MultiHostUrl:
         return MultiHostUrl.build(
             scheme="postgresql+psycopg",
             username=self.POSTGRES_USER,
@@ -66,6 +72,67 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Per-engine, per-worker limits: max connections = workers * (size + overflow)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT: float = 30.0
+    # Seconds after which a connection is replaced, keep below server idle timeouts
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Record Prometheus metrics and serve them to superusers at /metrics
+    METRICS_ENABLED: bool = True
+    # Let superusers profile a request with an X-Profile header or ?_profile=1
+    PROFILING_ENABLED: bool = False
+    # Seconds between stack samples while a request is profiled
+    PROFILING_SAMPLE_INTERVAL: float = 0.001
+    # Where profiles are written, as folded stacks for flamegraph.pl or speedscope
+    PROFILING_DIR: str = "/tmp/profiles"
+    # Count SQL statements and DB time per request, sent as a Server-Timing header
+    SQL_STATS_ENABLED: bool = False
+    # Log a likely N+1 when one normalized statement repeats more in a request
+    SQL_REPEAT_THRESHOLD: int = 10
+
+    # Read replicas as "host" or "host:port", reads use the primary when empty
+    POSTGRES_REPLICA_SERVERS: Annotated[
+        list[str] | str, BeforeValidator(parse_cors)
+    ] = []
+    # Replicas further behind the primary than this many seconds are skipped
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 10.0
+    # Seconds a client keeps reading from the primary after its own write
+    DB_REPLICA_STICKY_SECONDS: float = 10.0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_URIS(self) -> list[MultiHostUrl]:
+        uris = []
+        for server in self.POSTGRES_REPLICA_SERVERS:
+            host, _, port = server.partition(":")
+            uris.append(
+                MultiHostUrl.build(
+                    scheme="postgresql+psycopg",
+                    username=self.POSTGRES_USER,
+                    password=self.POSTGRES_PASSWORD,
+                    host=host,
+                    port=int(port) if port else self.POSTGRES_PORT,
+                    path=self.POSTGRES_DB,
+                )
+            )
+        return uris
+
+    # Counter rows per course that enrollments spread their increments over
+    ENROLLMENT_COUNTER_SLOTS: int = 16
+    # Seconds between folds of the counter rows into course.enrollment_count, 0 disables
+    ENROLLMENT_COUNT_FOLD_INTERVAL: float = 60.0
+
+    # Response bodies smaller than this many bytes are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1024
+    # Compressed bodies of GET responses, keyed by content hash, 0 disables
+    COMPRESSION_CACHE_TTL: float = 300.0
+    COMPRESSION_CACHE_MAX_SIZE: int = 512
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -75,6 +142,14 @@ class Settings(BaseSettings):
     # TODO: update type to EmailStr when sqlmodel supports it
     EMAILS_FROM_EMAIL: str | None = None
     EMAILS_FROM_NAME: str | None = None
+    # Seconds to wait on the SMTP server before giving up on a command
+    SMTP_TIMEOUT: float = 10.0
+    # Messages sent over one SMTP session before it is replaced, relays cap this
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    # Idle seconds after which the session is dropped instead of reused
+    SMTP_IDLE_TIMEOUT: float = 30.0
+    # Messages per second per worker, 0 means no limit
+    SMTP_RATE_LIMIT: float = 10.0
 
     @model_validator(mode="after")
     def _set_default_emails_from(self) -> Self:
@@ -84,6 +159,37 @@ class Settings(BaseSettings):
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
 
+    # Seconds between polls of the outbound email queue, 0 disables sending here
+    EMAIL_QUEUE_POLL_INTERVAL: float = 5.0
+    # Emails claimed and sent per poll
+    EMAIL_QUEUE_BATCH_SIZE: int = 20
+    # Delivery attempts before an email is marked failed
+    EMAIL_MAX_ATTEMPTS: int = 8
+    # Retry delay doubles per failed attempt from the base, up to the cap
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    # Hours sent and failed emails stay in the queue table, 0 keeps them forever
+    EMAIL_QUEUE_RETENTION_HOURS: float = 7 * 24.0
+    # Throttle credential endpoints with token buckets per client IP and per email
+    RATE_LIMIT_ENABLED: bool = True
+    # memory keeps buckets per worker, postgres shares them between workers
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    # Seconds for an empty bucket to refill, limits below are requests per window
+    RATE_LIMIT_WINDOW: float = 60.0
+    LOGIN_RATE_LIMIT_PER_IP: int = 30
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5
+    PASSWORD_RECOVERY_RATE_LIMIT_PER_IP: int = 10
+    PASSWORD_RECOVERY_RATE_LIMIT_PER_EMAIL: int = 3
+    # Buckets kept by the memory backend, least recently used are dropped first
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    # IPs or networks of the reverse proxies whose X-Forwarded-For is believed,
+    # without them every client behind Traefik shares the proxy's IP
+    TRUSTED_PROXIES: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+    # Seconds between batches hashing plaintext user profile passwords, 0 disables
+    USER_PROFILE_PASSWORD_HASH_INTERVAL: float = 10.0
+    # Profiles hashed per batch, each one is a full bcrypt run on the hash executor
+    USER_PROFILE_PASSWORD_HASH_BATCH_SIZE: int = 8
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def emails_enabled(self) -> bool:
@@ -1,10 +1,94 @@
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud
+from app.core import metrics
 from app.core.config import settings
+from app.core.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+    pool_status,
+)
+from app.core.replicas import ReplicaRouter
+from app.core.sql_stats import instrument
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+def engine_options() -> dict[str, Any]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **engine_options(),
+)
+# psycopg 3 ships its own asyncio driver, so the same URI works for both engines
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncQueuePool,
+    **engine_options(),
+)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+replica_engines = [
+    create_engine(str(uri), poolclass=InstrumentedQueuePool, **engine_options())
+    for uri in settings.SQLALCHEMY_REPLICA_URIS
+]
+# Same order as replica_engines, so an index from replica_router picks either
+async_replica_engines = [
+    create_async_engine(
+        str(uri), poolclass=InstrumentedAsyncQueuePool, **engine_options()
+    )
+    for uri in settings.SQLALCHEMY_REPLICA_URIS
+]
+for replica_engine in replica_engines:
+    instrument_engine(replica_engine)
+for async_replica_engine in async_replica_engines:
+    instrument_engine(async_replica_engine.sync_engine)
+
+for sync_engine in [engine, *replica_engines]:
+    instrument(sync_engine)
+for any_async_engine in [async_engine, *async_replica_engines]:
+    instrument(any_async_engine.sync_engine)
+
+replica_router = ReplicaRouter(
+    replica_engines,
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+    lag_check_interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
+    sticky_seconds=settings.DB_REPLICA_STICKY_SECONDS,
+)
+
+
+def named_engines() -> list[tuple[str, Engine]]:
+    """
+    Every engine's pool name and sync engine, async engines included.
+    """
+    engines = [("primary", engine), ("primary_async", async_engine.sync_engine)]
+    for index, replica_engine in enumerate(replica_engines):
+        engines.append((f"replica_{index}", replica_engine))
+    for index, async_replica_engine in enumerate(async_replica_engines):
+        engines.append((f"replica_{index}_async", async_replica_engine.sync_engine))
+    return engines
+
+
+for pool_name, named_engine in named_engines():
+    metrics.instrument(named_engine, pool=pool_name)
+
+
+def get_pools_status() -> list[dict[str, Any]]:
+    return [pool_status(name, engine) for name, engine in named_engines()]
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
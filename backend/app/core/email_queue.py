@@ -0,0 +1,101 @@
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.crud import email_crud
+
+logger = logging.getLogger(__name__)
+
+# Seconds between deletions of emails past EMAIL_QUEUE_RETENTION_HOURS
+PRUNE_INTERVAL = 3600.0
+
+
+class EmailQueueMetrics:
+    """
+    Delivery counters and SMTP latency of the sender in this worker.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.attempts_failed = 0
+        self.send_seconds_total = 0.0
+        self.send_seconds_max = 0.0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.sent += 1
+            else:
+                self.attempts_failed += 1
+            self.send_seconds_total += seconds
+            self.send_seconds_max = max(self.send_seconds_max, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            attempts = self.sent + self.attempts_failed
+            return {
+                "sent": self.sent,
+                "attempts_failed": self.attempts_failed,
+                "send_seconds_avg": (
+                    self.send_seconds_total / attempts if attempts else 0.0
+                ),
+                "send_seconds_max": self.send_seconds_max,
+            }
+
+
+metrics = EmailQueueMetrics()
+
+
+def retry_delay(attempts: int) -> float | None:
+    """
+    Seconds before the next try after attempts failures, None once out of tries.
+
+    Exponential with full jitter, so a relay outage doesn't end in a retry storm.
+    """
+    if attempts >= settings.EMAIL_MAX_ATTEMPTS:
+        return None
+    ceiling = min(
+        settings.EMAIL_RETRY_MAX_SECONDS,
+        settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+    )
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def process_due_emails(*, session: Session, deliver: Callable[..., None]) -> int:
+    """
+    Send one batch of due emails with deliver, returning how many were tried.
+
+    deliver raises on failure. The batch stays locked until its outcomes commit.
+    """
+    emails = email_crud.claim_due_emails(
+        session=session, limit=settings.EMAIL_QUEUE_BATCH_SIZE
+    )
+    for email in emails:
+        start = time.perf_counter()
+        try:
+            deliver(
+                email_to=email.email_to,
+                subject=email.subject,
+                html_content=email.html_content,
+            )
+        except Exception as e:
+            metrics.record(time.perf_counter() - start, ok=False)
+            retry_in = retry_delay(email.attempts + 1)
+            if retry_in is None:
+                logger.error(f"Giving up on email {email.id}: {e}")
+            else:
+                logger.warning(f"Email {email.id} failed, retrying in {retry_in:.0f}s")
+            email_crud.mark_failed_attempt(email=email, error=str(e), retry_in=retry_in)
+        else:
+            metrics.record(time.perf_counter() - start, ok=True)
+            email_crud.mark_sent(email=email)
+        session.add(email)
+    session.commit()
+    return len(emails)
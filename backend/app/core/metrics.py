@@ -0,0 +1,153 @@
+import os
+import time
+from typing import Any
+
+import prometheus_client
+from fastapi.routing import APIRoute
+from prometheus_client import CollectorRegistry, Gauge, Histogram, multiprocess
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Under gunicorn every worker writes its samples to files in this directory and
+# a scrape of any worker sums them, see scripts/gunicorn_conf.py
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5)
+
+# Labelled by route unique id, e.g. items-read_items, never by raw path
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last of its response.",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statements executed and their duration.",
+    ["pool"],
+    buckets=DB_BUCKETS,
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Connections each pool keeps open, overflow not included.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of each pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "bcrypt calls queued or running on the password hash executor.",
+    multiprocess_mode="livesum",
+)
+
+
+def enabled() -> bool:
+    return settings.METRICS_ENABLED
+
+
+def route_name(scope: Scope) -> str:
+    # The router stores the matched route in the scope we passed down
+    route = scope.get("route")
+    if isinstance(route, APIRoute):
+        return route.unique_id
+    return "unmatched"
+
+
+def _before_cursor_execute(
+    _conn: Any, _cursor: Any, _statement: str, _params: Any, context: Any, _many: bool
+) -> None:
+    context._metrics_start = time.perf_counter()
+
+
+def instrument(engine: Engine, *, pool: str) -> None:
+    """
+    Record statement durations and pool checkouts of engine, labelled pool.
+    """
+    if not enabled():
+        return
+    DB_POOL_SIZE.labels(pool).set(engine.pool.size())  # type: ignore[attr-defined]
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool)
+    statement_duration = DB_STATEMENT_DURATION.labels(pool)
+
+    def after_cursor_execute(
+        _conn: Any,
+        _cursor: Any,
+        _statement: str,
+        _params: Any,
+        context: Any,
+        _many: bool,
+    ) -> None:
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            statement_duration.observe(time.perf_counter() - start)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "checkout", lambda *_args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *_args: checked_out.dec())
+
+
+def password_hash_queued(delta: int) -> None:
+    if enabled():
+        PASSWORD_HASH_QUEUE_DEPTH.inc(delta)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """
+    Samples in the Prometheus text format, summed over workers under gunicorn.
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    else:
+        registry = prometheus_client.REGISTRY
+    content = prometheus_client.generate_latest(registry)
+    return content, prometheus_client.CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    Time every request and count the ones in flight when METRICS_ENABLED is set.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            REQUEST_DURATION.labels(route_name(scope), method, str(status)).observe(
+                time.perf_counter() - start
+            )
@@ -0,0 +1,26 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(interval: float, job: Callable[[], Any]) -> None:
+    """
+    Run job every interval seconds until cancelled.
+
+    Coroutine functions are awaited, blocking jobs run in a thread. Failures are
+    logged and the job is tried again on the next tick.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if asyncio.iscoroutinefunction(job):
+                await job()
+            else:
+                await run_in_threadpool(job)
+        except Exception:
+            logger.exception(f"Periodic job {job.__name__} failed")
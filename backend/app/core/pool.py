@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters for one connection pool, shared across its recreations."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+class _InstrumentedPoolMixin:
+    # Set right after the engine is built, see instrument_engine()
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            entry: ConnectionPoolEntry = super()._do_get()  # type: ignore[misc]
+        except TimeoutError:
+            if self.metrics:
+                self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        if self.metrics:
+            self.metrics.record_checkout(time.perf_counter() - start)
+        return entry
+
+    def recreate(self) -> Any:
+        # engine.dispose() swaps in a fresh pool, keep counting into the same metrics
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine) -> PoolMetrics:
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics  # type: ignore[attr-defined]
+    return metrics
+
+
+def pool_status(name: str, engine: Engine) -> dict[str, Any]:
+    pool = engine.pool
+    metrics: PoolMetrics | None = getattr(pool, "metrics", None)
+    status: dict[str, Any] = {
+        "name": name,
+        "size": pool.size(),  # type: ignore[attr-defined]
+        "checked_in": pool.checkedin(),  # type: ignore[attr-defined]
+        "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+        "overflow": pool.overflow(),  # type: ignore[attr-defined]
+    }
+    status.update(metrics.snapshot() if metrics else PoolMetrics().snapshot())
+    return status
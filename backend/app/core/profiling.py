@@ -0,0 +1,88 @@
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+
+from app.core.config import settings
+
+# Profile ids are file names, keep them to characters safe in a URL and a path
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+PROFILE_SUFFIX = ".folded"
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def _folded_stack(thread_name: str, frame: FrameType | None) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Samples the stack of every other thread each interval seconds while running.
+
+    Stacks are kept in the folded format flamegraph.pl and speedscope read, one
+    line per distinct stack with the thread name as its root frame. Sync routes
+    run on a threadpool thread and async ones on the event loop, so all threads
+    are sampled; requests running at the same time show up too.
+    """
+
+    def __init__(self, *, interval: float) -> None:
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    stack = _folded_stack(names.get(ident, str(ident)), frame)
+                    self.samples[stack] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+
+def new_profile_id(label: str) -> str:
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return f"{timestamp}-{_UNSAFE.sub('_', label)}-{uuid.uuid4().hex[:8]}"
+
+
+def save_profile(sampler: StackSampler, profile_id: str) -> None:
+    directory = Path(settings.PROFILING_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{profile_id}{PROFILE_SUFFIX}").write_text(sampler.folded())
+
+
+def read_profile(profile_id: str) -> str | None:
+    if _UNSAFE.search(profile_id) or profile_id.startswith("."):
+        return None
+    path = Path(settings.PROFILING_DIR) / f"{profile_id}{PROFILE_SUFFIX}"
+    if not path.is_file():
+        return None
+    return path.read_text()
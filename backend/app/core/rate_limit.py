@@ -0,0 +1,187 @@
+import ipaddress
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Protocol
+
+from fastapi import HTTPException, Request, status
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.db import engine
+from app.crud import rate_limit_crud
+
+
+class RateLimitBackend(Protocol):
+    def take(self, key: str, capacity: float, refill_rate: float) -> float:
+        """
+        Take a token from the key's bucket, returning 0 or seconds until one refills.
+        """
+        ...
+
+
+class MemoryBackend:
+    """
+    Token buckets in this worker's memory, each worker limits on its own.
+    """
+
+    def __init__(self, *, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> (tokens, monotonic time they were counted at)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: str, capacity: float, refill_rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / refill_rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class PostgresBackend:
+    """
+    Token buckets in the ratelimitbucket table, shared by every worker.
+    """
+
+    def take(self, key: str, capacity: float, refill_rate: float) -> float:
+        with Session(engine) as session:
+            return rate_limit_crud.take_token(
+                session=session, key=key, capacity=capacity, refill_rate=refill_rate
+            )
+
+
+_backend: RateLimitBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> RateLimitBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if settings.RATE_LIMIT_BACKEND == "postgres":
+                _backend = PostgresBackend()
+            else:
+                _backend = MemoryBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+        return _backend
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    name: str
+    per_ip: int
+    per_email: int
+
+
+def login_limit() -> RateLimit:
+    return RateLimit(
+        name="login",
+        per_ip=settings.LOGIN_RATE_LIMIT_PER_IP,
+        per_email=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    )
+
+
+def password_recovery_limit() -> RateLimit:
+    return RateLimit(
+        name="password-recovery",
+        per_ip=settings.PASSWORD_RECOVERY_RATE_LIMIT_PER_IP,
+        per_email=settings.PASSWORD_RECOVERY_RATE_LIMIT_PER_EMAIL,
+    )
+
+
+@lru_cache(maxsize=8)
+def _trusted_networks(
+    proxies: tuple[str, ...],
+) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    networks = _trusted_networks(tuple(settings.TRUSTED_PROXIES))
+    return any(address in network for network in networks)
+
+
+def client_ip(request: Request) -> str:
+    """
+    The IP that connected to the first trusted proxy in front of us.
+
+    X-Forwarded-For is read right to left and only while the hop that added an
+    entry is a trusted proxy, so a client can't pick its own IP by sending one.
+    """
+    host = request.client.host if request.client else "unknown"
+    if not _is_trusted(host):
+        return host
+    forwarded = ",".join(request.headers.getlist("X-Forwarded-For"))
+    for hop in reversed([hop.strip() for hop in forwarded.split(",")]):
+        if not hop:
+            break
+        host = hop
+        if not _is_trusted(host):
+            break
+    return host
+
+
+def check_rate_limit(limit: RateLimit, *, client_ip: str, email: str) -> float:
+    """
+    Take a token from the IP's and then the email's bucket for limit.
+
+    Returns 0 when both had one, else seconds until the request would pass.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return 0.0
+    backend = get_backend()
+    buckets = (
+        (f"{limit.name}:ip:{client_ip}", limit.per_ip),
+        (f"{limit.name}:email:{email.strip().lower()}", limit.per_email),
+    )
+    for key, capacity in buckets:
+        if capacity <= 0:
+            continue
+        wait = backend.take(key, capacity, capacity / settings.RATE_LIMIT_WINDOW)
+        if wait:
+            return wait
+    return 0.0
+
+
+def enforce_rate_limit(limit: RateLimit, *, request: Request, email: str) -> None:
+    """
+    Reject the request with 429 once its client IP or email ran out of tokens.
+
+    Call it before any query or password hashing, that is what it saves.
+    """
+    wait = check_rate_limit(limit, client_ip=client_ip(request), email=email)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, try again later",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+async def enforce_rate_limit_async(
+    limit: RateLimit, *, request: Request, email: str
+) -> None:
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        enforce_rate_limit(limit, request=request, email=email)
+    else:
+        await run_in_threadpool(enforce_rate_limit, limit, request=request, email=email)
@@ -0,0 +1,138 @@
+import logging
+import math
+import threading
+import time
+
+from sqlalchemy import Engine, text
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Zero when the replica has replayed everything it received, so an idle primary
+# doesn't make a caught-up replica look stale
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+# Unix time of the client's last write, sent back so any worker can honour it
+LAST_WRITE_COOKIE = "last_write"
+# Where deps record a commit made while handling the request, in scope["state"]
+LAST_WRITE_STATE = "last_write"
+
+
+class ReplicaRouter:
+    """
+    Round-robin choice of a read replica.
+
+    Replicas whose measured lag exceeds max_lag, or that fail the lag check, are
+    skipped until the next check. Reads by a client that wrote within
+    sticky_seconds, by its last write time, go to the primary so it reads its
+    own writes. choose() returns the replica index, or None for the primary.
+    """
+
+    def __init__(
+        self,
+        engines: list[Engine],
+        *,
+        max_lag: float,
+        lag_check_interval: float,
+        sticky_seconds: float,
+    ) -> None:
+        self.engines = engines
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.sticky_seconds = sticky_seconds
+        self._lock = threading.Lock()
+        self._next = 0
+        self._healthy = [True] * len(engines)
+        self._checked_at = [float("-inf")] * len(engines)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def is_sticky(self, written_at: float | None) -> bool:
+        # Either way, so clock skew between app servers doesn't drop a write
+        return (
+            written_at is not None
+            and abs(time.time() - written_at) < self.sticky_seconds
+        )
+
+    def measure_lag(self, index: int) -> float:
+        with self.engines[index].connect() as connection:
+            return float(connection.execute(LAG_QUERY).scalar_one())
+
+    @property
+    def check_due(self) -> bool:
+        now = time.monotonic()
+        return any(
+            now - checked_at >= self.lag_check_interval
+            for checked_at in self._checked_at
+        )
+
+    def refresh_health(self) -> None:
+        """
+        Re-measure lag on replicas whose last check is older than the interval.
+
+        Blocks on the probe queries, async callers should run it in a thread.
+        """
+        for index in range(len(self.engines)):
+            now = time.monotonic()
+            with self._lock:
+                if now - self._checked_at[index] < self.lag_check_interval:
+                    continue
+                # Claim the check so concurrent requests don't all probe the replica
+                self._checked_at[index] = now
+            try:
+                healthy = self.measure_lag(index) <= self.max_lag
+            except Exception as e:
+                logger.warning(f"Read replica {index} failed its lag check: {e}")
+                healthy = False
+            with self._lock:
+                self._healthy[index] = healthy
+
+    def choose(self, written_at: float | None = None) -> int | None:
+        if not self.enabled or self.is_sticky(written_at):
+            return None
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.engines)
+            for offset in range(len(self.engines)):
+                index = (start + offset) % len(self.engines)
+                if self._healthy[index]:
+                    return index
+        return None
+
+
+class LastWriteMiddleware:
+    """
+    Set the last write cookie on responses to requests that committed a write.
+
+    The cookie outlives the worker that handled the write, so a read served by
+    any other worker or host still goes to the primary for sticky_seconds.
+    """
+
+    def __init__(self, app: ASGIApp, *, router: ReplicaRouter) -> None:
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            written_at = scope.get("state", {}).get(LAST_WRITE_STATE)
+            if message["type"] == "http.response.start" and written_at is not None:
+                max_age = math.ceil(self.router.sticky_seconds)
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{LAST_WRITE_COOKIE}={written_at:.3f}; Max-Age={max_age}; "
+                    "Path=/; HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
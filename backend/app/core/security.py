@@ -1,16 +1,41 @@
+import asyncio
+import multiprocessing
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, TypeVar
 
 import jwt
 from passlib.context import CryptContext
 
+from app.core import metrics
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.models import TokenPayload, User
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 ALGORITHM = "HS256"
 
+# Decoded claims and expiry timestamp, keyed by the raw token
+token_cache: TTLCache[tuple[TokenPayload, float]] = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL
+)
+# Detached User snapshots keyed by str(user.id), merge them into a session to use
+user_cache: TTLCache[User] = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL
+)
+
+
+def invalidate_user(user_id: uuid.UUID | str) -> None:
+    """
+    Drop the cached snapshot of a user, call it after committing a change to them.
+    """
+    user_cache.pop(str(user_id))
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
@@ -25,3 +50,80 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password, with a new hash when the stored one uses outdated settings.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+T = TypeVar("T")
+
+_hash_executor: Executor | None = None
+_hash_lock = threading.Lock()
+# Hashing calls submitted and not finished yet, running ones included
+_hash_pending = 0
+
+
+def get_hash_executor() -> Executor:
+    global _hash_executor
+    with _hash_lock:
+        if _hash_executor is None:
+            if settings.PASSWORD_HASH_EXECUTOR == "process":
+                # spawn, forking a process that already runs threads can deadlock
+                _hash_executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_CONCURRENCY,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_CONCURRENCY,
+                    thread_name_prefix="password-hash",
+                )
+        return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    with _hash_lock:
+        executor, _hash_executor = _hash_executor, None
+    if executor:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def hash_queue_depth() -> int:
+    return _hash_pending
+
+
+async def _run_hashing(func: Callable[..., T], *args: Any) -> T:
+    global _hash_pending
+    with _hash_lock:
+        _hash_pending += 1
+    metrics.password_hash_queued(1)
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        with _hash_lock:
+            _hash_pending -= 1
+        metrics.password_hash_queued(-1)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hashing(get_password_hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await _run_hashing(
+        verify_and_update_password, plain_password, hashed_password
+    )
@@ -0,0 +1,124 @@
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+
+from app.core.config import settings
+
+
+class SMTPMailer:
+    """
+    Sends messages over one persistent SMTP session per worker.
+
+    The TLS handshake and login happen once per session instead of once per
+    message. The session is replaced after SMTP_MAX_MESSAGES_PER_CONNECTION
+    messages or SMTP_IDLE_TIMEOUT idle seconds, and reopened once if the server
+    dropped it. Sending is paced to SMTP_RATE_LIMIT messages per second.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._smtp: smtplib.SMTP | None = None
+        self._sent_on_connection = 0
+        self._last_used = 0.0
+        self._next_send_at = 0.0
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        assert settings.SMTP_HOST
+        smtp_class: type[smtplib.SMTP] = (
+            smtplib.SMTP_SSL if settings.SMTP_SSL else smtplib.SMTP
+        )
+        smtp = smtp_class(
+            settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT
+        )
+        try:
+            if settings.SMTP_TLS and not settings.SMTP_SSL:
+                smtp.starttls()
+            if settings.SMTP_USER and settings.SMTP_PASSWORD:
+                smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        self.connections_opened += 1
+        self._sent_on_connection = 0
+        return smtp
+
+    def _connection(self) -> smtplib.SMTP:
+        now = time.monotonic()
+        if self._smtp is not None and (
+            self._sent_on_connection >= settings.SMTP_MAX_MESSAGES_PER_CONNECTION
+            or now - self._last_used > settings.SMTP_IDLE_TIMEOUT
+        ):
+            self._close()
+        if self._smtp is None:
+            self._smtp = self._connect()
+        return self._smtp
+
+    def _close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except OSError:
+            self._smtp.close()
+        self._smtp = None
+
+    def _discard(self) -> None:
+        if self._smtp is not None:
+            self._smtp.close()
+            self._smtp = None
+
+    def _wait_for_rate_limit(self) -> None:
+        if settings.SMTP_RATE_LIMIT <= 0:
+            return
+        now = time.monotonic()
+        if self._next_send_at > now:
+            time.sleep(self._next_send_at - now)
+        interval = 1 / settings.SMTP_RATE_LIMIT
+        self._next_send_at = max(now, self._next_send_at) + interval
+
+    def send(self, message: EmailMessage) -> None:
+        with self._lock:
+            self._wait_for_rate_limit()
+            reused = self._smtp is not None
+            try:
+                self._connection().send_message(message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                if not reused:
+                    self._close()
+                    raise
+                # The relay closed an idle session on its side, retry on a new one
+                self._discard()
+                try:
+                    self._connection().send_message(message)
+                except OSError:
+                    self._close()
+                    raise
+            except smtplib.SMTPResponseException:
+                # Refused message, the session itself is still usable
+                raise
+            except OSError:
+                self._close()
+                raise
+            self._sent_on_connection += 1
+            self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+
+def build_message(*, email_to: str, subject: str, html_content: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr(
+        (settings.EMAILS_FROM_NAME or "", settings.EMAILS_FROM_EMAIL or "")
+    )
+    message["To"] = email_to
+    message["Subject"] = subject
+    message.set_content(html_content, subtype="html")
+    return message
+
+
+mailer = SMTPMailer()
@@ -0,0 +1,129 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fail the request instead of logging when a statement repeats, used by tests
+raise_on_repeat = False
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists and multi-row VALUES differ only in how many params they bind
+_PARAM_LIST = re.compile(r"\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+class RepeatedStatementError(AssertionError):
+    pass
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PARAM_LIST.sub("(?)", statement)
+    return _NUMBER.sub("?", statement)
+
+
+class SQLStats:
+    """
+    Statements executed and time spent in the database during one request.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count > threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} statements"'
+
+
+_current: ContextVar[SQLStats | None] = ContextVar("sql_stats", default=None)
+
+
+def current_stats() -> SQLStats | None:
+    return _current.get()
+
+
+def _before_cursor_execute(
+    _conn: Any, _cursor: Any, _statement: str, _params: Any, context: Any, _many: bool
+) -> None:
+    if _current.get() is not None:
+        context._sql_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(
+    _conn: Any, _cursor: Any, statement: str, _params: Any, context: Any, _many: bool
+) -> None:
+    stats = _current.get()
+    start = getattr(context, "_sql_stats_start", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+def instrument(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def check_repeats(stats: SQLStats, path: str) -> None:
+    repeated = stats.repeated(settings.SQL_REPEAT_THRESHOLD)
+    if not repeated:
+        return
+    statement, count = repeated[0]
+    message = f"Possible N+1 in {path}: statement ran {count} times: {statement}"
+    if raise_on_repeat:
+        raise RepeatedStatementError(message)
+    logger.warning(message)
+
+
+class SQLStatsMiddleware:
+    """
+    Count statements and DB time per request when SQL_STATS_ENABLED is set.
+
+    Totals go out as a Server-Timing header, and statements repeated more than
+    SQL_REPEAT_THRESHOLD times in one request are reported as a likely N+1.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.SQL_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = SQLStats()
+        token = _current.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                check_repeats(stats, scope["path"])
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
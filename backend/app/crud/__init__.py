@@ -1,3 +1,5 @@
-from .user_item_crud import create_user
-from .user_item_crud import create_item
-from .user_item_crud import authenticate
+from .user_item_crud import authenticate as authenticate
+from .user_item_crud import create_item as create_item
+from .user_item_crud import create_user as create_user
+from .user_item_crud import get_user_by_email as get_user_by_email
+from .user_item_crud import update_user as update_user
@@ -0,0 +1,192 @@
+import re
+import uuid
+from typing import Any
+
+from sqlalchemy import literal_column
+from sqlalchemy.orm import defer, selectinload
+from sqlmodel import col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import (
+    Course,
+    CourseAuthorLink,
+    CourseChapter,
+    CourseEnrollmentCounter,
+    CourseFacet,
+    CourseFacetCount,
+    UserEnrollment,
+    UserProfile,
+)
+
+# Every relationship a course page renders, one SELECT ... IN per level. The
+# search document is only read by Postgres, never ship it back to Python.
+COURSE_DETAIL_OPTIONS = (
+    defer(Course.search_vector),  # type: ignore[arg-type]
+    selectinload(Course.authors).selectinload(CourseAuthorLink.author),  # type: ignore[arg-type]
+    selectinload(Course.prices),  # type: ignore[arg-type]
+    selectinload(Course.chapters).selectinload(CourseChapter.resources),  # type: ignore[arg-type]
+    selectinload(Course.thumbnail),  # type: ignore[arg-type]
+)
+COURSE_SUMMARY_OPTIONS = (
+    defer(Course.search_vector),  # type: ignore[arg-type]
+    selectinload(Course.authors).selectinload(CourseAuthorLink.author),  # type: ignore[arg-type]
+    selectinload(Course.prices),  # type: ignore[arg-type]
+)
+
+
+# Facets maintained by the triggers on course and price, in display order
+FACETS = ("category", "level", "price_band")
+
+
+def course_filters(
+    *,
+    categories: list[str] | None = None,
+    level: str | None = None,
+    price_band: str | None = None,
+) -> list[Any]:
+    """
+    WHERE clauses for a faceted course listing, several categories must all match.
+    """
+    filters: list[Any] = []
+    if categories:
+        # jsonb @> is answered by the GIN index on categories
+        filters.append(col(Course.categories).contains(categories))
+    if level is not None:
+        filters.append(Course.level == level)
+    if price_band is not None:
+        filters.append(
+            select(CourseFacet.course_id)
+            .where(
+                CourseFacet.course_id == Course.id,
+                CourseFacet.facet == "price_band",
+                CourseFacet.value == price_band,
+            )
+            .exists()
+        )
+    return filters
+
+
+async def get_courses(
+    *,
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: uuid.UUID | None = None,
+    filters: list[Any] | None = None,
+) -> list[Course]:
+    """
+    Courses ordered by id with authors and prices loaded, in a fixed number of queries.
+    """
+    statement = select(Course).options(*COURSE_SUMMARY_OPTIONS).order_by(col(Course.id))
+    if filters:
+        statement = statement.where(*filters)
+    if after is not None:
+        statement = statement.where(Course.id > after)
+    else:
+        statement = statement.offset(skip)
+    statement = statement.limit(limit)
+    return list((await session.exec(statement)).all())
+
+
+async def count_courses(
+    *, session: AsyncSession, filters: list[Any] | None = None
+) -> int:
+    statement = select(func.count()).select_from(Course)
+    if filters:
+        statement = statement.where(*filters)
+    return (await session.exec(statement)).one()
+
+
+async def get_enrollment_counts(
+    *, session: AsyncSession, id: uuid.UUID
+) -> tuple[int, int] | None:
+    """
+    Folded and not yet folded enrollment counts of a course, their sum is exact.
+    """
+    pending = (
+        select(func.coalesce(func.sum(CourseEnrollmentCounter.count), 0))
+        .where(CourseEnrollmentCounter.course_id == id)
+        .scalar_subquery()
+    )
+    statement = select(Course.enrollment_count, pending).where(Course.id == id)
+    row = (await session.exec(statement)).one_or_none()
+    if row is None:
+        return None
+    folded, pending_count = row
+    return folded, int(pending_count)
+
+
+async def get_facet_counts(
+    *, session: AsyncSession
+) -> dict[str, list[tuple[str, int]]]:
+    """
+    Course counts per facet value, read from the trigger-maintained totals.
+    """
+    statement = (
+        select(CourseFacetCount.facet, CourseFacetCount.value, CourseFacetCount.count)
+        .where(CourseFacetCount.count > 0)
+        .order_by(col(CourseFacetCount.count).desc(), CourseFacetCount.value)
+    )
+    facets: dict[str, list[tuple[str, int]]] = {facet: [] for facet in FACETS}
+    for facet, value, count in (await session.exec(statement)).all():
+        facets.setdefault(facet, []).append((value, count))
+    return facets
+
+
+async def get_course_name(*, session: AsyncSession, id: uuid.UUID) -> str | None:
+    statement = select(Course.course_name).where(Course.id == id)
+    return (await session.exec(statement)).one_or_none()
+
+
+async def get_enrolled_learners(
+    *, session: AsyncSession, id: uuid.UUID
+) -> list[tuple[str, str]]:
+    """
+    (email, full_name) of every user profile enrolled in a course.
+    """
+    statement = (
+        select(UserProfile.email, UserProfile.full_name)
+        .join(UserEnrollment, col(UserEnrollment.user_id) == col(UserProfile.id))
+        .where(UserEnrollment.course_id == id)
+        .order_by(col(UserProfile.email))
+    )
+    return list((await session.exec(statement)).all())
+
+
+async def get_course_detail(*, session: AsyncSession, id: uuid.UUID) -> Course | None:
+    statement = select(Course).where(Course.id == id).options(*COURSE_DETAIL_OPTIONS)
+    return (await session.exec(statement)).one_or_none()
+
+
+def to_prefix_tsquery(q: str) -> str | None:
+    """
+    Turn free text into a tsquery that matches every word as a prefix.
+
+    Only word characters survive, so the result is always valid tsquery syntax.
+    """
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+async def search_courses(
+    *, session: AsyncSession, q: str, skip: int = 0, limit: int = 20
+) -> list[tuple[Course, float]]:
+    """
+    Courses matching q, best ranked first, served by the GIN index on search_vector.
+    """
+    tsquery_text = to_prefix_tsquery(q)
+    if tsquery_text is None:
+        return []
+    tsquery = func.to_tsquery(literal_column("'english'::regconfig"), tsquery_text)
+    rank = func.ts_rank_cd(Course.search_vector, tsquery).label("rank")
+    statement = (
+        select(Course, rank)
+        .where(col(Course.search_vector).op("@@")(tsquery))
+        .options(*COURSE_SUMMARY_OPTIONS)
+        .order_by(rank.desc(), col(Course.id))
+        .offset(skip)
+        .limit(limit)
+    )
+    return list((await session.exec(statement)).all())
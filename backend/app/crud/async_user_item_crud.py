@@ -0,0 +1,100 @@
+import uuid
+
+from sqlmodel import col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security import get_password_hash_async, verify_password_async
+from app.models import Item, ItemCreate, User, UserCreate
+
+
+async def create_user(*, session: AsyncSession, user_create: UserCreate) -> User:
+    hashed_password = await get_password_hash_async(user_create.password)
+    db_obj = User.model_validate(
+        user_create, update={"hashed_password": hashed_password}
+    )
+    session.add(db_obj)
+    await session.commit()
+    await session.refresh(db_obj)
+    return db_obj
+
+
+async def get_user_by_email(*, session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    session_user = (await session.exec(statement)).first()
+    return session_user
+
+
+async def authenticate(
+    *, session: AsyncSession, email: str, password: str
+) -> User | None:
+    db_user = await get_user_by_email(session=session, email=email)
+    if not db_user:
+        return None
+    if not await verify_password_async(password, db_user.hashed_password):
+        return None
+    return db_user
+
+
+async def get_users(
+    *,
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: uuid.UUID | None = None,
+) -> list[User]:
+    """
+    Users ordered by id. With after set, keyset pagination replaces the offset.
+    """
+    statement = select(User).order_by(col(User.id))
+    if after is not None:
+        statement = statement.where(User.id > after)
+    else:
+        statement = statement.offset(skip)
+    statement = statement.limit(limit)
+    return list((await session.exec(statement)).all())
+
+
+async def count_users(*, session: AsyncSession) -> int:
+    statement = select(func.count()).select_from(User)
+    return (await session.exec(statement)).one()
+
+
+async def get_items(
+    *,
+    session: AsyncSession,
+    owner_id: uuid.UUID | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    after: uuid.UUID | None = None,
+) -> list[Item]:
+    """
+    Items ordered by id. With after set, keyset pagination replaces the offset.
+    """
+    statement = select(Item).order_by(col(Item.id))
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)
+    if after is not None:
+        statement = statement.where(Item.id > after)
+    else:
+        statement = statement.offset(skip)
+    statement = statement.limit(limit)
+    return list((await session.exec(statement)).all())
+
+
+async def count_items(
+    *, session: AsyncSession, owner_id: uuid.UUID | None = None
+) -> int:
+    statement = select(func.count()).select_from(Item)
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)
+    return (await session.exec(statement)).one()
+
+
+async def create_item(
+    *, session: AsyncSession, item_in: ItemCreate, owner_id: uuid.UUID
+) -> Item:
+    db_item = Item.model_validate(item_in, update={"owner_id": owner_id})
+    session.add(db_item)
+    await session.commit()
+    await session.refresh(db_item)
+    return db_item
@@ -0,0 +1,137 @@
+import asyncio
+import secrets
+import uuid
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security import (
+    get_password_hash_async,
+    verify_and_update_password_async,
+)
+from app.models import UserProfile
+
+
+async def get_user_profile_by_email(
+    *, session: AsyncSession, email: str
+) -> UserProfile | None:
+    query = select(UserProfile).where(UserProfile.email == email)
+    user_profile = (await session.exec(query)).one_or_none()
+    return user_profile
+
+
+async def get_user_profile_by_id(
+    *, session: AsyncSession, id: UUID
+) -> UserProfile | None:
+    query = select(UserProfile).where(UserProfile.id == id)
+    return (await session.exec(query)).one_or_none()
+
+
+async def create_user_profile(session: AsyncSession, user: UserProfile) -> UserProfile:
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+async def update_user_profile(session: AsyncSession, user: UserProfile) -> UserProfile:
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+async def set_password(*, user: UserProfile, password: str) -> None:
+    user.hashed_password = await get_password_hash_async(password)
+    user.password = None
+
+
+async def verify_user_password(
+    *, session: AsyncSession, user: UserProfile, password: str
+) -> bool:
+    """
+    Check a sign-in password, rehashing it when the stored hash is outdated.
+
+    Rows not converted yet are checked against the plaintext column and hashed
+    on the spot.
+    """
+    if user.hashed_password is None:
+        if user.password is None or not secrets.compare_digest(
+            user.password.encode(), password.encode()
+        ):
+            return False
+        new_hash: str | None = await get_password_hash_async(password)
+    else:
+        verified, new_hash = await verify_and_update_password_async(
+            password, user.hashed_password
+        )
+        if not verified:
+            return False
+    if new_hash:
+        user.hashed_password = new_hash
+        user.password = None
+        session.add(user)
+        await session.commit()
+    return True
+
+
+async def authenticate_user(
+    *, session: AsyncSession, email: str, password: str
+) -> UserProfile | None:
+    user = await get_user_profile_by_email(session=session, email=email)
+    if user and await verify_user_password(
+        session=session, user=user, password=password
+    ):
+        return user
+    return None
+
+
+async def hash_plaintext_passwords(*, session: AsyncSession, batch_size: int) -> int:
+    """
+    Hash one batch of plaintext passwords, returning how many rows were converted.
+
+    No lock is held while bcrypt runs. Each row is only updated if its password
+    is still the one that was hashed, so a concurrent sign-in, update or worker
+    converting it first wins. Batches start at a random id to keep workers apart.
+    """
+    unhashed = (
+        col(UserProfile.hashed_password).is_(None),
+        col(UserProfile.password).is_not(None),
+    )
+    statement = select(UserProfile.id, UserProfile.password).where(*unhashed)
+    start = uuid.uuid4()
+    rows = (
+        await session.exec(
+            statement.where(col(UserProfile.id) >= start)
+            .order_by(col(UserProfile.id))
+            .limit(batch_size)
+        )
+    ).all()
+    if not rows:
+        rows = (
+            await session.exec(
+                statement.order_by(col(UserProfile.id)).limit(batch_size)
+            )
+        ).all()
+    # End the read transaction, hashing takes a while
+    await session.commit()
+    passwords = {id: password for id, password in rows if password is not None}
+    hashes = await asyncio.gather(
+        *(get_password_hash_async(password) for password in passwords.values())
+    )
+    converted = 0
+    for (id, password), hashed_password in zip(passwords.items(), hashes, strict=True):
+        result = await session.exec(
+            update(UserProfile)  # type: ignore[call-overload]
+            .where(
+                col(UserProfile.id) == id,
+                col(UserProfile.password) == password,
+                *unhashed,
+            )
+            .values(hashed_password=hashed_password, password=None)
+        )
+        converted += result.rowcount
+    await session.commit()
+    return converted
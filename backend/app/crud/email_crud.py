@@ -0,0 +1,114 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlmodel import Session, col, delete, func, select
+
+from app.models import OutboundEmail
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+def enqueue_email(
+    *, session: Session, email_to: str, subject: str, html_content: str
+) -> OutboundEmail:
+    email = OutboundEmail(email_to=email_to, subject=subject, html_content=html_content)
+    session.add(email)
+    session.commit()
+    return email
+
+
+def enqueue_emails(*, session: Session, emails: list[tuple[str, str, str]]) -> int:
+    """
+    Queue (email_to, subject, html_content) triples with one multi-row insert.
+    """
+    if not emails:
+        return 0
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "email_to": email_to,
+            "subject": subject,
+            "html_content": html_content,
+            "status": PENDING,
+            "attempts": 0,
+            "created_at": now,
+            "next_attempt_at": now,
+        }
+        for email_to, subject, html_content in emails
+    ]
+    session.execute(insert(OutboundEmail), rows)
+    session.commit()
+    return len(rows)
+
+
+def claim_due_emails(*, session: Session, limit: int) -> list[OutboundEmail]:
+    """
+    Lock up to limit due emails for this transaction.
+
+    SKIP LOCKED lets several workers poll at once without sending an email twice.
+    """
+    statement = (
+        select(OutboundEmail)
+        .where(
+            OutboundEmail.status == PENDING,
+            OutboundEmail.next_attempt_at <= datetime.utcnow(),
+        )
+        .order_by(col(OutboundEmail.next_attempt_at))
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(session.exec(statement).all())
+
+
+def mark_sent(*, email: OutboundEmail) -> None:
+    email.status = SENT
+    email.attempts += 1
+    email.sent_at = datetime.utcnow()
+    email.last_error = None
+    email.html_content = None
+
+
+def mark_failed_attempt(
+    *, email: OutboundEmail, error: str, retry_in: float | None
+) -> None:
+    """
+    Record a failed attempt, retry_in None gives up on the email.
+    """
+    email.attempts += 1
+    email.last_error = error[:1000]
+    if retry_in is None:
+        email.status = FAILED
+        email.html_content = None
+    else:
+        email.next_attempt_at = datetime.utcnow() + timedelta(seconds=retry_in)
+
+
+def get_queue_counts(*, session: Session) -> tuple[int, int, datetime | None]:
+    """
+    Pending count, failed count and creation time of the oldest pending email.
+    """
+    statement = select(
+        func.count().filter(col(OutboundEmail.status) == PENDING),
+        func.count().filter(col(OutboundEmail.status) == FAILED),
+        func.min(OutboundEmail.created_at).filter(col(OutboundEmail.status) == PENDING),
+    )
+    pending, failed, oldest = session.exec(statement).one()
+    return pending, failed, oldest
+
+
+def prune_emails(*, session: Session, older_than_hours: float) -> int:
+    """
+    Delete sent and failed emails created more than older_than_hours ago.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=older_than_hours)
+    statement = delete(OutboundEmail).where(
+        col(OutboundEmail.status) != PENDING,
+        col(OutboundEmail.created_at) < cutoff,
+    )
+    result = session.exec(statement)  # type: ignore[call-overload]
+    session.commit()
+    return int(result.rowcount)
@@ -0,0 +1,154 @@
+import random
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Uuid, any_, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.models import Course, CourseEnrollmentCounter, UserEnrollment, UserProfile
+
+# Rows per INSERT, 4 parameters each keeps a batch well under the 65535 limit
+BULK_ENROLLMENT_BATCH_SIZE = 5000
+
+ENROLLED = "enrolled"
+ALREADY_ENROLLED = "already_enrolled"
+DUPLICATE = "duplicate"
+UNKNOWN_USER = "unknown_user"
+UNKNOWN_COURSE = "unknown_course"
+
+# Drain every slot and apply the totals in one statement, so an increment is
+# either folded or left for the next run, never both
+FOLD_STATEMENT = text(
+    """
+    WITH drained AS (
+        DELETE FROM courseenrollmentcounter RETURNING course_id, count
+    ), totals AS (
+        SELECT course_id, sum(count) AS total FROM drained GROUP BY course_id
+    )
+    UPDATE course SET enrollment_count = course.enrollment_count + totals.total
+    FROM totals
+    WHERE course.id = totals.course_id
+    RETURNING course.id
+    """
+)
+
+
+def increment_enrollment_counts(
+    *, session: Session, counts: dict[uuid.UUID, int]
+) -> None:
+    """
+    Add to the enrollment counts of several courses without touching their rows.
+
+    Each course's delta goes to a random slot, negative deltas subtract. Every
+    write that inserts or deletes UserEnrollment rows must call this in the same
+    transaction, bulk_enroll is the only one so far. The caller commits.
+    """
+    if not counts:
+        return
+    rows = [
+        {
+            "course_id": course_id,
+            "slot": random.randrange(settings.ENROLLMENT_COUNTER_SLOTS),
+            "count": count,
+        }
+        for course_id, count in counts.items()
+        if count
+    ]
+    if not rows:
+        return
+    # Upserts take row locks in VALUES order, keep it the same for every caller
+    rows.sort(key=lambda row: (row["course_id"], row["slot"]))
+    statement = insert(CourseEnrollmentCounter).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["course_id", "slot"],
+        set_={"count": CourseEnrollmentCounter.count + statement.excluded.count},
+    )
+    session.execute(statement)
+
+
+def fold_enrollment_counts(*, session: Session) -> int:
+    """
+    Move the pending slot counts into course.enrollment_count.
+
+    Returns how many courses were updated.
+    """
+    folded = len(session.execute(FOLD_STATEMENT).all())
+    session.commit()
+    return folded
+
+
+def _existing_ids(
+    session: Session, id_column: Any, ids: Iterable[uuid.UUID]
+) -> set[uuid.UUID]:
+    # One array parameter instead of an expanded IN list, whatever the id count
+    ids_param = bindparam("ids", list(ids), type_=ARRAY(Uuid()))
+    statement = select(id_column).where(col(id_column) == any_(ids_param))
+    return set(session.exec(statement).all())
+
+
+def bulk_enroll(
+    *,
+    session: Session,
+    pairs: list[tuple[uuid.UUID, uuid.UUID]],
+    status: str | None = None,
+) -> list[str]:
+    """
+    Enroll (user_id, course_id) pairs, returning one outcome per pair in order.
+
+    Ids are checked with one query per table and rows go in batched
+    INSERT ... ON CONFLICT DO NOTHING statements, all in one transaction along
+    with the counter increments of the rows actually inserted.
+    """
+    user_ids = _existing_ids(session, UserProfile.id, {u for u, _ in pairs})
+    course_ids = _existing_ids(session, Course.id, {c for _, c in pairs})
+
+    outcomes: list[str] = []
+    to_insert: dict[tuple[uuid.UUID, uuid.UUID], int] = {}
+    for index, (user_id, course_id) in enumerate(pairs):
+        if user_id not in user_ids:
+            outcomes.append(UNKNOWN_USER)
+        elif course_id not in course_ids:
+            outcomes.append(UNKNOWN_COURSE)
+        elif (user_id, course_id) in to_insert:
+            outcomes.append(DUPLICATE)
+        else:
+            # Filled in once we know whether the insert conflicted
+            to_insert[(user_id, course_id)] = index
+            outcomes.append(ENROLLED)
+
+    now = datetime.utcnow()
+    # Sorted so concurrent bulk requests lock unique index entries in the same
+    # order and can't deadlock
+    rows = [
+        {
+            "user_id": user_id,
+            "course_id": course_id,
+            "enrollment_date": now,
+            "status": status,
+        }
+        for user_id, course_id in sorted(to_insert)
+    ]
+    inserted: set[tuple[uuid.UUID, uuid.UUID]] = set()
+    for start in range(0, len(rows), BULK_ENROLLMENT_BATCH_SIZE):
+        statement = (
+            insert(UserEnrollment)
+            .values(rows[start : start + BULK_ENROLLMENT_BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=["user_id", "course_id"])
+            .returning(col(UserEnrollment.user_id), col(UserEnrollment.course_id))
+        )
+        inserted.update(tuple(row) for row in session.execute(statement))
+
+    for pair, index in to_insert.items():
+        if pair not in inserted:
+            outcomes[index] = ALREADY_ENROLLED
+    increment_enrollment_counts(
+        session=session,
+        counts=dict(Counter(course_id for _, course_id in inserted)),
+    )
+    session.commit()
+    return outcomes
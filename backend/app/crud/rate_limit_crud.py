@@ -0,0 +1,55 @@
+from sqlalchemy import text
+from sqlmodel import Session
+
+# Tokens in the bucket now, the stored count plus what refilled since last use
+_REFILLED = (
+    "LEAST(:capacity, ratelimitbucket.tokens + :refill_rate"
+    " * EXTRACT(EPOCH FROM localtimestamp - ratelimitbucket.updated_at))"
+)
+
+# Refill and take a token in one statement, so concurrent workers can't both
+# spend the last one
+TAKE_TOKEN_STATEMENT = text(
+    f"""
+    INSERT INTO ratelimitbucket (key, tokens, updated_at, allowed)
+    VALUES (:key, :capacity - 1, localtimestamp, true)
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = CASE WHEN {_REFILLED} >= 1
+            THEN {_REFILLED} - 1 ELSE {_REFILLED} END,
+        updated_at = localtimestamp,
+        allowed = {_REFILLED} >= 1
+    RETURNING tokens, allowed
+    """
+)
+
+PRUNE_STATEMENT = text(
+    """
+    DELETE FROM ratelimitbucket
+    WHERE updated_at < localtimestamp - make_interval(secs => :idle_seconds)
+    """
+)
+
+
+def take_token(
+    *, session: Session, key: str, capacity: float, refill_rate: float
+) -> float:
+    """
+    Take a token from the key's bucket, returning 0 or seconds until one refills.
+    """
+    tokens, allowed = session.execute(
+        TAKE_TOKEN_STATEMENT,
+        {"key": key, "capacity": capacity, "refill_rate": refill_rate},
+    ).one()
+    session.commit()
+    if allowed:
+        return 0.0
+    return float((1 - tokens) / refill_rate)
+
+
+def prune_buckets(*, session: Session, idle_seconds: float) -> int:
+    """
+    Delete buckets unused for idle_seconds, they would have refilled anyway.
+    """
+    result = session.execute(PRUNE_STATEMENT, {"idle_seconds": idle_seconds})
+    session.commit()
+    return int(result.rowcount)  # type: ignore[attr-defined]
@@ -1,10 +1,23 @@
 import uuid
+from collections import defaultdict
 from typing import Any
 
-from sqlmodel import Session, select
+from sqlalchemy import Uuid, any_, bindparam, column, delete, insert, update, values
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Session, col, select
+from sqlmodel.sql.expression import Select
 
-from app.core.security import get_password_hash, verify_password
-from app.models import Item, ItemCreate, User, UserCreate, UserUpdate, ContactMessage
+from app.core.security import get_password_hash, invalidate_user, verify_password
+from app.models import (
+    ContactMessage,
+    Item,
+    ItemBulkUpdate,
+    ItemCreate,
+    User,
+    UserCreate,
+    UserProfile,
+    UserUpdate,
+)
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -28,6 +41,7 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     session.add(db_user)
     session.commit()
     session.refresh(db_user)
+    invalidate_user(db_user.id)
     return db_user
 
 
@@ -54,14 +68,124 @@ def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -
     return db_item
 
 
-def create_contact_message(session: Session, contact_message: ContactMessage) -> ContactMessage:
+# Rows per UPDATE ... FROM (VALUES ...), inserts are batched by insertmanyvalues
+ITEM_BULK_BATCH_SIZE = 1000
+
+
+def _ids_param(ids: list[uuid.UUID]) -> Any:
+    # One array parameter instead of an expanded IN list, whatever the id count
+    return bindparam("ids", ids, type_=ARRAY(Uuid()))
+
+
+def get_item_owners(
+    *, session: Session, ids: list[uuid.UUID]
+) -> dict[uuid.UUID, uuid.UUID]:
+    """
+    Owners of the existing items among ids, keyed by item id.
+
+    The rows stay locked until the transaction ends, so a permission check on
+    the owners still holds when the caller updates or deletes them. They are
+    locked in id order, two bulk requests can't deadlock on each other.
+    """
+    statement = (
+        select(Item.id, Item.owner_id)
+        .where(col(Item.id) == any_(_ids_param(ids)))
+        .order_by(col(Item.id))
+        .with_for_update()
+    )
+    return dict(session.exec(statement).all())
+
+
+def create_items(
+    *, session: Session, items_in: list[ItemCreate], owner_id: uuid.UUID
+) -> list[Item]:
+    """
+    Insert items with multi-row INSERT ... RETURNING. The caller commits.
+    """
+    rows = [
+        {**item_in.model_dump(), "id": uuid.uuid4(), "owner_id": owner_id}
+        for item_in in items_in
+    ]
+    statement = insert(Item).returning(Item, sort_by_parameter_order=True)
+    return list(session.scalars(statement, rows))
+
+
+def update_items(*, session: Session, items_in: list[ItemBulkUpdate]) -> list[Item]:
+    """
+    Apply partial updates with UPDATE ... FROM (VALUES ...) RETURNING.
+
+    Updates are grouped by the fields they set, so a field left out of one
+    update is never overwritten. Returns the items in input order. The caller
+    commits.
+    """
+    groups: defaultdict[tuple[str, ...], list[dict[str, Any]]] = defaultdict(list)
+    for item_in in items_in:
+        data = item_in.model_dump(exclude_unset=True)
+        groups[tuple(sorted(name for name in data if name != "id"))].append(data)
+
+    items: dict[uuid.UUID, Item] = {}
+    for fields, rows in groups.items():
+        if not fields:
+            unchanged = [row["id"] for row in rows]
+            query = select(Item).where(col(Item.id) == any_(_ids_param(unchanged)))
+            items.update((item.id, item) for item in session.exec(query))
+            continue
+        names = ("id", *fields)
+        for start in range(0, len(rows), ITEM_BULK_BATCH_SIZE):
+            batch = rows[start : start + ITEM_BULK_BATCH_SIZE]
+            table = Item.__table__  # type: ignore[attr-defined]
+            source = values(
+                *(column(name, table.c[name].type) for name in names), name="source"
+            ).data([tuple(row[name] for name in names) for row in batch])
+            statement = (
+                update(Item)
+                .where(col(Item.id) == source.c.id)
+                .values({name: source.c[name] for name in fields})
+                .returning(Item)
+                .execution_options(synchronize_session=False)
+            )
+            items.update((item.id, item) for item in session.scalars(statement))
+    return [items[item_in.id] for item_in in items_in]
+
+
+def delete_items(*, session: Session, ids: list[uuid.UUID]) -> int:
+    """
+    Delete items in one statement. The caller commits.
+    """
+    statement = (
+        delete(Item)
+        .where(col(Item.id) == any_(_ids_param(ids)))
+        .returning(col(Item.id))
+    )
+    return len(session.execute(statement).all())
+
+
+def create_contact_message(
+    session: Session, contact_message: ContactMessage
+) -> ContactMessage:
     session.add(contact_message)
     session.commit()
     session.refresh(contact_message)
     return contact_message
 
 
-def get_contact_messages(session: Session):
-    query = select(ContactMessage)
-    message = session.exec(query).all()
-    return message
+def contact_messages_with_profiles_statement(
+    skip: int = 0, limit: int = 100
+) -> Select[tuple[ContactMessage, UserProfile]]:
+    """
+    One joined SELECT for a page of messages and their senders' profiles.
+    """
+    return (
+        select(ContactMessage, UserProfile)
+        .join(UserProfile, col(ContactMessage.user_profile_id) == col(UserProfile.id))
+        .order_by(col(ContactMessage.id))
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def get_contact_messages_with_profiles(
+    session: Session, skip: int = 0, limit: int = 100
+) -> list[tuple[ContactMessage, UserProfile]]:
+    statement = contact_messages_with_profiles_statement(skip=skip, limit=limit)
+    return list(session.exec(statement).all())
@@ -16,27 +16,20 @@ def get_user_profile_by_id(*, session: Session, id: UUID) -> UserProfile | None:
     return session.exec(query).one_or_none()
 
 
-def create_user_profile(session: Session, user: UserProfile):
+def create_user_profile(session: Session, user: UserProfile) -> UserProfile:
     session.add(user)
     session.commit()
     session.refresh(user)
     return user
 
 
-def delete_by_user(session: Session, user: UserProfile):
+def delete_by_user(session: Session, user: UserProfile) -> None:
     session.delete(user)
     session.commit()
 
 
-def update_user_profile(session: Session, user: UserProfile):
+def update_user_profile(session: Session, user: UserProfile) -> UserProfile:
     session.add(user)
     session.commit()
     session.refresh(user)
     return user
-
-
-def authenticate_user(*, session: Session, email: str, password: str) -> UserProfile | None:
-    user = get_user_profile_by_email(session=session, email=email)
-    if user and user.password == password:
-        return user
-    return None
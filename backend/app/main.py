@@ -1,10 +1,35 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.profiling import ProfilingMiddleware
+from app.api.responses import PydanticJSONResponse
+from app.api.routes import metrics
+from app.core import email_queue
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.db import async_engine, async_replica_engines, engine, replica_router
+from app.core.metrics import MetricsMiddleware
+from app.core.periodic import run_periodically
+from app.core.replicas import LastWriteMiddleware
+from app.core.security import shutdown_hash_executor
+from app.core.smtp import mailer
+from app.core.sql_stats import SQLStatsMiddleware
+from app.crud import (
+    async_user_profile_crud,
+    email_crud,
+    enrollment_crud,
+    rate_limit_crud,
+)
+from app.utils import deliver_email
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,10 +39,98 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+def fold_enrollment_counts() -> None:
+    with Session(engine) as session:
+        enrollment_crud.fold_enrollment_counts(session=session)
+
+
+def process_email_queue() -> None:
+    if not settings.emails_enabled:
+        return
+    with Session(engine) as session:
+        email_queue.process_due_emails(session=session, deliver=deliver_email)
+
+
+def prune_email_queue() -> None:
+    with Session(engine) as session:
+        email_crud.prune_emails(
+            session=session, older_than_hours=settings.EMAIL_QUEUE_RETENTION_HOURS
+        )
+
+
+def prune_rate_limit_buckets() -> None:
+    with Session(engine) as session:
+        rate_limit_crud.prune_buckets(
+            session=session, idle_seconds=settings.RATE_LIMIT_WINDOW
+        )
+
+
+async def hash_user_profile_passwords() -> None:
+    # Async so waiting on the hash executor doesn't hold a request thread
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        await async_user_profile_crud.hash_plaintext_passwords(
+            session=session, batch_size=settings.USER_PROFILE_PASSWORD_HASH_BATCH_SIZE
+        )
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    tasks = []
+    if settings.ENROLLMENT_COUNT_FOLD_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    settings.ENROLLMENT_COUNT_FOLD_INTERVAL, fold_enrollment_counts
+                )
+            )
+        )
+    if settings.EMAIL_QUEUE_POLL_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    settings.EMAIL_QUEUE_POLL_INTERVAL, process_email_queue
+                )
+            )
+        )
+    if settings.EMAIL_QUEUE_RETENTION_HOURS > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(email_queue.PRUNE_INTERVAL, prune_email_queue)
+            )
+        )
+    if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND == "postgres":
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(settings.RATE_LIMIT_WINDOW, prune_rate_limit_buckets)
+            )
+        )
+    if settings.USER_PROFILE_PASSWORD_HASH_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    settings.USER_PROFILE_PASSWORD_HASH_INTERVAL,
+                    hash_user_profile_passwords,
+                )
+            )
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+    # Pooled async connections belong to the loop that opened them
+    await async_engine.dispose()
+    for async_replica_engine in async_replica_engines:
+        await async_replica_engine.dispose()
+    shutdown_hash_executor()
+    mailer.close()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=PydanticJSONResponse,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -30,7 +143,20 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["*"]
+        expose_headers=["*"],
     )
 
+# Only does work when read replicas are configured
+app.add_middleware(LastWriteMiddleware, router=replica_router)
+# Only does work when SQL_STATS_ENABLED is set
+app.add_middleware(SQLStatsMiddleware)
+# Only does work when PROFILING_ENABLED is set and a superuser asks for it
+app.add_middleware(ProfilingMiddleware)
+# Outside SQL stats so its timing covers everything the app does for a request
+app.add_middleware(MetricsMiddleware)
+# Outermost, so it sees the final headers and body
+app.add_middleware(CompressionMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+# Outside the API prefix, where scrapers look for it
+app.include_router(metrics.router, tags=["metrics"])
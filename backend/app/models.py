@@ -1,11 +1,11 @@
-
-from datetime import datetime
-from sqlalchemy import Time, JSON
 import uuid
+from datetime import datetime
+from decimal import Decimal
 
-from pydantic import EmailStr, condecimal
-from sqlmodel import Field, Relationship, SQLModel, Column, ForeignKey
-from typing import List, Dict, Optional
+from pydantic import EmailStr
+from sqlalchemy import JSON, Computed, Index, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlmodel import Column, Field, ForeignKey, Relationship, SQLModel
 
 
 # Shared properties
@@ -59,7 +59,10 @@ class UserPublic(UserBase):
 
 class UsersPublic(SQLModel):
     data: list[UserPublic]
-    count: int
+    # None when the caller passed include_count=false
+    count: int | None
+    # Pass back as ?cursor= to fetch the next page, None on the last page
+    next_cursor: str | None = None
 
 
 # Shared properties
@@ -78,8 +81,31 @@ class ItemUpdate(ItemBase):
     title: str | None = Field(default=None, min_length=1, max_length=255)  # type: ignore
 
 
+# Most items accepted by one /items/bulk call
+ITEMS_BULK_MAX = 10_000
+
+
+class ItemsBulkCreate(SQLModel):
+    data: list[ItemCreate] = Field(min_length=1, max_length=ITEMS_BULK_MAX)
+
+
+class ItemBulkUpdate(ItemUpdate):
+    id: uuid.UUID
+
+
+class ItemsBulkUpdate(SQLModel):
+    data: list[ItemBulkUpdate] = Field(min_length=1, max_length=ITEMS_BULK_MAX)
+
+
+class ItemsBulkDelete(SQLModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=ITEMS_BULK_MAX)
+
+
 # Database model, database table inferred from class name
 class Item(ItemBase, table=True):
+    # Serves keyset pagination of one owner's items
+    __table_args__ = (Index("ix_item_owner_id_id", "owner_id", "id"),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=255)
     owner_id: uuid.UUID = Field(
@@ -96,7 +122,10 @@ class ItemPublic(ItemBase):
 
 class ItemsPublic(SQLModel):
     data: list[ItemPublic]
-    count: int
+    # None when the caller passed include_count=false
+    count: int | None
+    # Pass back as ?cursor= to fetch the next page, None on the last page
+    next_cursor: str | None = None
 
 
 # Generic message
@@ -104,6 +133,43 @@ class Message(SQLModel):
     message: str
 
 
+# Connection pool state and checkout counters for one engine
+class PoolStatus(SQLModel):
+    name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class PoolsStatus(SQLModel):
+    data: list[PoolStatus]
+
+
+# Size and hit/miss counters of one in-process cache
+class CacheStatus(SQLModel):
+    name: str
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+
+
+class CachesStatus(SQLModel):
+    data: list[CacheStatus]
+
+
+# Password hashing executor load
+class PasswordHashingStatus(SQLModel):
+    executor: str
+    concurrency: int
+    queue_depth: int
+
+
 # JSON payload containing access token
 class Token(SQLModel):
     access_token: str
@@ -120,88 +186,197 @@ class NewPassword(SQLModel):
     new_password: str = Field(min_length=8, max_length=40)
 
 
+class EmailQueueStatus(SQLModel):
+    pending: int
+    failed: int
+    # Age of the oldest email still waiting to be sent, 0 when none is
+    oldest_pending_seconds: float
+    # Counters below are for this worker since it started
+    sent: int
+    attempts_failed: int
+    send_seconds_avg: float
+    send_seconds_max: float
+
+
+# Emails waiting for the background sender, see app.core.email_queue
+class OutboundEmail(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_outboundemail_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    email_to: str = Field(max_length=255)
+    subject: str = Field(max_length=255)
+    # Cleared once the email is sent or given up on, it can hold reset links
+    html_content: str | None = Field(default=None, sa_column=Column(Text))
+    # pending, sent or failed
+    status: str = Field(default="pending", max_length=16)
+    attempts: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: datetime | None = Field(default=None)
+    last_error: str | None = Field(default=None, max_length=1000)
+
+
+class RateLimitBucket(SQLModel, table=True):
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: str = Field(primary_key=True, max_length=255)
+    tokens: float
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Whether the last take got a token, RETURNING only sees the updated row
+    allowed: bool = Field(default=True)
+
+
 class UserProfile(SQLModel, table=True):
+    __table_args__ = (
+        # Rows still holding a plaintext password, for the conversion job
+        Index(
+            "ix_userprofile_unhashed",
+            "id",
+            postgresql_where=text("hashed_password IS NULL"),
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     full_name: str = Field(max_length=64, nullable=False)
     first_name: str = Field(max_length=64, nullable=True)
     last_name: str = Field(max_length=64, nullable=True)
     email: EmailStr = Field(unique=True, index=True, max_length=64, nullable=False)
     phone_number: str = Field(max_length=16, nullable=True)
-    password: str = Field(min_length=8, max_length=32, nullable=False)
+    # Plaintext from before passwords were hashed, cleared as rows are converted
+    password: str | None = Field(default=None, max_length=32, nullable=True)
+    hashed_password: str | None = Field(default=None, max_length=255)
     contact_messages: list["ContactMessage"] = Relationship(
         back_populates="user_profile", sa_relationship_kwargs={"cascade": "all, delete"}
     )
-    courses: List["UserEnrollment"] = Relationship(back_populates="user")
+    courses: list["UserEnrollment"] = Relationship(back_populates="user")
 
 
 class ContactMessage(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     message: str = Field(max_length=500)
     user_profile_id: uuid.UUID = Field(
-        sa_column=Column(ForeignKey("userprofile.id", ondelete="CASCADE"), nullable=False)
+        sa_column=Column(
+            ForeignKey("userprofile.id", ondelete="CASCADE"), nullable=False
+        )
     )
     user_profile: "UserProfile" = Relationship(back_populates="contact_messages")
 
 
+# Weighted search document, name ranks above description/categories above syllabus
+COURSE_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(course_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(categories::text, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(syllabus, '')), 'C')"
+)
+
+
 class Course(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_course_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_course_categories",
+            "categories",
+            postgresql_using="gin",
+            postgresql_ops={"categories": "jsonb_path_ops"},
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     course_name: str = Field(max_length=128, nullable=False)
-    description: Optional[str] = Field(max_length=255, nullable=True)
-    thumbnail_url: Optional[str] = Field(nullable=True)
-    rating: Optional[float] = Field(default=None, ge=0, le=5, nullable=True)
-    categories: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
-    content: Optional[List[Dict[str, str]]] = Field(default=None, sa_column=Column(JSON))
-    duration: Optional[int] = Field(nullable=True)
-    level: Optional[str] = Field(default=None)
-    released_date: Optional[datetime] = Field(default=None, nullable=True)
-    last_update: Optional[datetime] = Field(default_factory=datetime.utcnow, nullable=True)
+    description: str | None = Field(max_length=255, nullable=True)
+    thumbnail_url: str | None = Field(nullable=True)
+    rating: float | None = Field(default=None, ge=0, le=5, nullable=True)
+    categories: list[str] | None = Field(default=None, sa_column=Column(JSONB))
+    content: list[dict[str, str]] | None = Field(default=None, sa_column=Column(JSON))
+    duration: int | None = Field(nullable=True)
+    level: str | None = Field(default=None)
+    released_date: datetime | None = Field(default=None, nullable=True)
+    last_update: datetime | None = Field(default_factory=datetime.utcnow, nullable=True)
     enrollment_count: int = Field(default=0)
     certification: bool = Field(default=False)
-    discount_offers: Optional[str] = Field(max_length=255, nullable=True)
-    syllabus: Optional[str] = Field(max_length=2000, nullable=True)
+    discount_offers: str | None = Field(max_length=255, nullable=True)
+    syllabus: str | None = Field(max_length=2000, nullable=True)
     progress_tracking: bool = Field(default=False)
-    course_resource: Optional[str] = Field(max_length=500, nullable=True)
-    faqs: Optional[str] = Field(max_length=2000, nullable=True)
-    accessibility_features: Optional[str] = Field(max_length=255, nullable=True)
-    course_preview: Optional[str] = Field(nullable=True)
-    interactive_features: Optional[str] = Field(max_length=255, nullable=True)
-    video_quality_option: Optional[str] = Field(max_length=255, nullable=True)
+    course_resource: str | None = Field(max_length=500, nullable=True)
+    faqs: str | None = Field(max_length=2000, nullable=True)
+    accessibility_features: str | None = Field(max_length=255, nullable=True)
+    course_preview: str | None = Field(nullable=True)
+    interactive_features: str | None = Field(max_length=255, nullable=True)
+    video_quality_option: str | None = Field(max_length=255, nullable=True)
+    # Generated by Postgres on every insert/update, never set it from Python
+    search_vector: str | None = Field(
+        default=None,
+        sa_column=Column(TSVECTOR, Computed(COURSE_SEARCH_VECTOR, persisted=True)),
+    )
+
+    authors: list["CourseAuthorLink"] = Relationship(back_populates="course")
+    prices: list["Price"] = Relationship(back_populates="course")
+    chapters: list["CourseChapter"] = Relationship(back_populates="course")
+    thumbnail: list["Thumbnail"] = Relationship(back_populates="course")
+    enrollments: list["UserEnrollment"] = Relationship(back_populates="course")
+    resources: list["CourseResource"] = Relationship(back_populates="course")
+
+
+# Kept in sync with course.categories/level and price.amount by database
+# triggers (see migration c5a7e9b3d214), never write these tables from Python
+class CourseFacet(SQLModel, table=True):
+    __table_args__ = (Index("ix_coursefacet_facet_value", "facet", "value"),)
 
-    authors: List["CourseAuthorLink"] = Relationship(back_populates="course")
-    prices: List["Price"] = Relationship(back_populates="course")
-    chapters: List["CourseChapter"] = Relationship(back_populates="course")
-    thumbnail: List["Thumbnail"] = Relationship(back_populates="course")
-    enrollments: List["UserEnrollment"] = Relationship(back_populates="course")
-    resources: List["CourseResource"] = Relationship(back_populates="course")
+    course_id: uuid.UUID = Field(
+        sa_column=Column(ForeignKey("course.id", ondelete="CASCADE"), primary_key=True)
+    )
+    facet: str = Field(max_length=32, primary_key=True)
+    value: str = Field(max_length=128, primary_key=True)
+
+
+class CourseFacetCount(SQLModel, table=True):
+    facet: str = Field(max_length=32, primary_key=True)
+    value: str = Field(max_length=128, primary_key=True)
+    count: int = Field(default=0)
+
+
+# Pending enrollment_count deltas, spread over slots so concurrent enrollments
+# don't queue on one row lock. Folded into course.enrollment_count periodically.
+# Written through enrollment_crud.increment_enrollment_counts only, every path
+# adding or removing enrollments has to go through it or the counts drift.
+class CourseEnrollmentCounter(SQLModel, table=True):
+    course_id: uuid.UUID = Field(
+        sa_column=Column(ForeignKey("course.id", ondelete="CASCADE"), primary_key=True)
+    )
+    slot: int = Field(primary_key=True)
+    count: int = Field(default=0)
 
 
 class Author(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str = Field(max_length=64, nullable=False)
-    bio: Optional[str] = Field(max_length=256, nullable=True)
-    email: Optional[EmailStr] = Field(max_length=256, nullable=True)
-    website: Optional[str] = Field(max_length=256, nullable=True)
-    expertise: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
-    qualification: Optional[str] = Field(max_length=256, nullable=True)
-    experience_years: Optional[int] = Field(nullable=True)
-    certifications: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
-    location: Optional[str] = Field(max_length=32, nullable=True)
-    languages: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
-    contact_number: Optional[str] = Field(max_length=12, nullable=True)
-    join_date: Optional[datetime] = Field(default_factory=datetime.utcnow, nullable=True)
-    last_active: Optional[datetime] = Field(nullable=True)
-
-    courses: List["CourseAuthorLink"] = Relationship(back_populates="author")
+    bio: str | None = Field(max_length=256, nullable=True)
+    email: EmailStr | None = Field(max_length=256, nullable=True)
+    website: str | None = Field(max_length=256, nullable=True)
+    expertise: list[str] | None = Field(default=None, sa_column=Column(JSON))
+    qualification: str | None = Field(max_length=256, nullable=True)
+    experience_years: int | None = Field(nullable=True)
+    certifications: list[str] | None = Field(default=None, sa_column=Column(JSON))
+    location: str | None = Field(max_length=32, nullable=True)
+    languages: list[str] | None = Field(default=None, sa_column=Column(JSON))
+    contact_number: str | None = Field(max_length=12, nullable=True)
+    join_date: datetime | None = Field(default_factory=datetime.utcnow, nullable=True)
+    last_active: datetime | None = Field(nullable=True)
+
+    courses: list["CourseAuthorLink"] = Relationship(back_populates="author")
 
 
 class Price(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    amount: condecimal(gt=0) = Field(nullable=False)
+    amount: Decimal = Field(gt=0, nullable=False)
     currency: str = Field(max_length=3, nullable=False, default="USD")
-    discount: Optional[str] = Field(ge=0, le=100, nullable=True)
-    start_date: Optional[datetime] = Field(default=None, nullable=True)
-    end_date: Optional[datetime] = Field(default=None, nullable=True)
-    description: Optional[str] = Field(max_length=255, nullable=True)
+    discount: str | None = Field(ge=0, le=100, nullable=True)
+    start_date: datetime | None = Field(default=None, nullable=True)
+    end_date: datetime | None = Field(default=None, nullable=True)
+    description: str | None = Field(max_length=255, nullable=True)
 
     course_id: uuid.UUID = Field(foreign_key="course.id")
     course: Course = Relationship(back_populates="prices")
@@ -218,19 +393,19 @@ class CourseAuthorLink(SQLModel, table=True):
 class CourseChapter(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=128, nullable=False)
-    content: Optional[str] = Field(nullable=True)
-    order: Optional[str] = Field(nullable=True)
+    content: str | None = Field(nullable=True)
+    order: str | None = Field(nullable=True)
 
     course_id: uuid.UUID = Field(foreign_key="course.id")
     course: Course = Relationship(back_populates="chapters")
 
-    resources: List["CourseResource"] = Relationship(back_populates="chapter")
+    resources: list["CourseResource"] = Relationship(back_populates="chapter")
 
 
 class Thumbnail(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     url: str = Field(max_length=255, nullable=False)
-    description: Optional[str] = Field(max_length=255, nullable=True)
+    description: str | None = Field(max_length=255, nullable=True)
     uploaded_date: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
     thumbnail_id: uuid.UUID = Field(foreign_key="course.id")
@@ -241,7 +416,7 @@ class UserEnrollment(SQLModel, table=True):
     user_id: uuid.UUID = Field(foreign_key="userprofile.id", primary_key=True)
     course_id: uuid.UUID = Field(foreign_key="course.id", primary_key=True)
     enrollment_date: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    status: Optional[str] = Field(max_length=64, nullable=True)
+    status: str | None = Field(max_length=64, nullable=True)
 
     user: UserProfile = Relationship(back_populates="courses")
     course: Course = Relationship(back_populates="enrollments")
@@ -250,7 +425,7 @@ class UserEnrollment(SQLModel, table=True):
 class CourseResource(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=128, nullable=False)
-    resource_url: Optional[str] = Field(nullable=True)
+    resource_url: str | None = Field(nullable=True)
 
     course_id: uuid.UUID = Field(foreign_key="course.id", nullable=False)
     chapter_id: uuid.UUID = Field(foreign_key="coursechapter.id", nullable=False)
@@ -264,5 +439,5 @@ class CourseResource(SQLModel, table=True):
 class ResourceType(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     type_name: str = Field(max_length=64, nullable=False)
-    description: Optional[str] = Field(nullable=True)
+    description: str | None = Field(nullable=True)
     # resources: List["CourseResource"] = Relationship(back_populates="resource_type")
@@ -1,7 +1,6 @@
-from typing import Optional
-
 from pydantic import BaseModel
-from app.models import ContactMessage
+
+from app.models import ContactMessage, UserProfile
 
 
 class ContactMessageRequest(BaseModel):
@@ -11,8 +10,19 @@ class ContactMessageRequest(BaseModel):
 
 class ContactMessageResponse(BaseModel):
     first_name: str
-    last_name: Optional[str]
+    last_name: str | None
     email: str
-    phone_number: Optional[str]
+    phone_number: str | None
     message: str
 
+
+def to_contact_message_res(
+    message: ContactMessage, user_profile: UserProfile
+) -> ContactMessageResponse:
+    return ContactMessageResponse(
+        first_name=user_profile.full_name,
+        last_name=user_profile.last_name,
+        email=user_profile.email,
+        phone_number=user_profile.phone_number,
+        message=message.message,
+    )
@@ -0,0 +1,185 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models import Author, Course, CourseChapter, CourseResource, Price, Thumbnail
+
+
+class AuthorRes(BaseModel):
+    id: UUID
+    name: str
+    bio: str | None = None
+    website: str | None = None
+    expertise: list[str] | None = None
+
+
+class PriceRes(BaseModel):
+    id: UUID
+    amount: Decimal
+    currency: str
+    discount: str | None = None
+    start_date: datetime | None = None
+    end_date: datetime | None = None
+    description: str | None = None
+
+
+class CourseResourceRes(BaseModel):
+    id: UUID
+    title: str
+    resource_url: str | None = None
+    resource_type_id: UUID
+
+
+class CourseChapterRes(BaseModel):
+    id: UUID
+    title: str
+    content: str | None = None
+    order: str | None = None
+    resources: list[CourseResourceRes]
+
+
+class ThumbnailRes(BaseModel):
+    id: UUID
+    url: str
+    description: str | None = None
+
+
+class CourseSummaryRes(BaseModel):
+    id: UUID
+    course_name: str
+    description: str | None = None
+    thumbnail_url: str | None = None
+    rating: float | None = None
+    categories: list[str] | None = None
+    duration: int | None = None
+    level: str | None = None
+    released_date: datetime | None = None
+    enrollment_count: int
+    certification: bool
+    authors: list[AuthorRes]
+    prices: list[PriceRes]
+
+
+class CoursesRes(BaseModel):
+    data: list[CourseSummaryRes]
+    count: int | None
+    next_cursor: str | None = None
+
+
+class CourseSearchHitRes(CourseSummaryRes):
+    rank: float
+
+
+class CourseSearchRes(BaseModel):
+    data: list[CourseSearchHitRes]
+
+
+class FacetValueRes(BaseModel):
+    value: str
+    count: int
+
+
+class CourseFacetsRes(BaseModel):
+    category: list[FacetValueRes]
+    level: list[FacetValueRes]
+    # under_20, 20_50, 50_100 or 100_plus, one count per band a course has a price in
+    price_band: list[FacetValueRes]
+
+
+class EnrollmentCountRes(BaseModel):
+    course_id: UUID
+    # What the catalog shows, lags by up to ENROLLMENT_COUNT_FOLD_INTERVAL
+    folded: int
+    pending: int
+    exact: int
+
+
+class CourseAnnouncementReq(BaseModel):
+    subject: str = Field(min_length=1, max_length=120)
+    message: str = Field(min_length=1, max_length=5000)
+
+
+class CourseDetailRes(CourseSummaryRes):
+    content: list[dict[str, str]] | None = None
+    last_update: datetime | None = None
+    discount_offers: str | None = None
+    syllabus: str | None = None
+    progress_tracking: bool
+    course_resource: str | None = None
+    faqs: str | None = None
+    accessibility_features: str | None = None
+    course_preview: str | None = None
+    interactive_features: str | None = None
+    video_quality_option: str | None = None
+    chapters: list[CourseChapterRes]
+    thumbnail: list[ThumbnailRes]
+
+
+def to_author_res(author: Author) -> AuthorRes:
+    return AuthorRes.model_validate(author, from_attributes=True)
+
+
+def to_price_res(price: Price) -> PriceRes:
+    return PriceRes.model_validate(price, from_attributes=True)
+
+
+def to_chapter_res(chapter: CourseChapter) -> CourseChapterRes:
+    return CourseChapterRes(
+        id=chapter.id,
+        title=chapter.title,
+        content=chapter.content,
+        order=chapter.order,
+        resources=[to_resource_res(resource) for resource in chapter.resources],
+    )
+
+
+def to_resource_res(resource: CourseResource) -> CourseResourceRes:
+    return CourseResourceRes.model_validate(resource, from_attributes=True)
+
+
+def to_thumbnail_res(thumbnail: Thumbnail) -> ThumbnailRes:
+    return ThumbnailRes.model_validate(thumbnail, from_attributes=True)
+
+
+def _course_fields(course: Course, model: type[BaseModel]) -> dict[str, Any]:
+    # Scalar columns only, relationships are converted by the callers
+    return {
+        name: getattr(course, name)
+        for name in model.model_fields
+        if name in Course.model_fields
+    }
+
+
+def to_course_summary_res(course: Course) -> CourseSummaryRes:
+    return CourseSummaryRes(
+        **_course_fields(course, CourseSummaryRes),
+        authors=[to_author_res(link.author) for link in course.authors],
+        prices=[to_price_res(price) for price in course.prices],
+    )
+
+
+def to_course_search_hit_res(course: Course, rank: float) -> CourseSearchHitRes:
+    return CourseSearchHitRes(**to_course_summary_res(course).model_dump(), rank=rank)
+
+
+def to_course_detail_res(course: Course) -> CourseDetailRes:
+    return CourseDetailRes(
+        **_course_fields(course, CourseDetailRes),
+        authors=[to_author_res(link.author) for link in course.authors],
+        prices=[to_price_res(price) for price in course.prices],
+        chapters=[to_chapter_res(chapter) for chapter in course.chapters],
+        thumbnail=[to_thumbnail_res(thumbnail) for thumbnail in course.thumbnail],
+    )
+
+
+def to_course_facets_res(facets: dict[str, list[tuple[str, int]]]) -> CourseFacetsRes:
+    return CourseFacetsRes(
+        **{
+            facet: [FacetValueRes(value=value, count=count) for value, count in values]
+            for facet, values in facets.items()
+            if facet in CourseFacetsRes.model_fields
+        }
+    )
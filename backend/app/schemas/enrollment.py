@@ -0,0 +1,47 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class EnrollmentRes(BaseModel):
+    user_id: UUID
+    course_id: UUID
+    enrollment_date: datetime
+    status: str | None = None
+
+
+class BulkEnrollmentItem(BaseModel):
+    user_id: UUID
+    course_id: UUID
+
+
+class BulkEnrollmentRequest(BaseModel):
+    items: list[BulkEnrollmentItem] = Field(min_length=1, max_length=50_000)
+    status: str | None = Field(default=None, max_length=64)
+
+
+class BulkEnrollmentResult(BaseModel):
+    user_id: UUID
+    course_id: UUID
+    # enrolled, already_enrolled, duplicate, unknown_user or unknown_course
+    outcome: str
+
+
+class BulkEnrollmentResponse(BaseModel):
+    enrolled: int
+    data: list[BulkEnrollmentResult]
+
+
+def to_bulk_enrollment_res(
+    items: list[BulkEnrollmentItem], outcomes: list[str]
+) -> BulkEnrollmentResponse:
+    return BulkEnrollmentResponse(
+        enrolled=outcomes.count("enrolled"),
+        data=[
+            BulkEnrollmentResult(
+                user_id=item.user_id, course_id=item.course_id, outcome=outcome
+            )
+            for item, outcome in zip(items, outcomes, strict=True)
+        ],
+    )
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel
 
 from app.models import UserProfile
@@ -10,11 +12,9 @@ class SigninRequest(BaseModel):
 
 class SigninResponse(BaseModel):
     email: str
-    password: str
 
 
-def to_signin_res(signin: UserProfile):
+def to_signin_res(signin: UserProfile) -> dict[str, Any]:
     return SigninResponse(
         email=signin.email,
-        password=signin.password
     ).dict()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any
 
 from pydantic import BaseModel
 
@@ -7,32 +7,35 @@ from app.models import UserProfile
 
 class CreateSignUp(BaseModel):
     full_name: str
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
-    phone_number: Optional[str] = None
+    first_name: str | None = None
+    last_name: str | None = None
+    phone_number: str | None = None
     email: str
     password: str
 
 
-class CreateSignUpRes(CreateSignUp):
-    pass
+class CreateSignUpRes(BaseModel):
+    full_name: str
+    first_name: str | None = None
+    last_name: str | None = None
+    phone_number: str | None = None
+    email: str
 
 
 class UpdateUserProfile(BaseModel):
-    full_name: Optional[str] = None
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
-    phone_number: Optional[str] = None
-    email: Optional[str] = None
-    password: Optional[str] = None
+    full_name: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    phone_number: str | None = None
+    email: str | None = None
+    password: str | None = None
 
 
-def to_signup_res(signup: UserProfile):
+def to_signup_res(signup: UserProfile) -> dict[str, Any]:
     return CreateSignUpRes(
         full_name=signup.full_name,
         first_name=signup.first_name,
         last_name=signup.last_name,
         phone_number=signup.phone_number,
         email=signup.email,
-        password=signup.password
     ).dict()
@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.tests.utils.user_profile import (
+    create_random_contact_message,
+    create_random_user_profile,
+)
+
+
+def count_statements(client: TestClient, params: dict[str, str | int]) -> int:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        r = client.get(f"{settings.API_V1_STR}/contactus/", params=params)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert r.status_code == 200
+    return len(statements)
+
+
+def test_get_contact_messages(client: TestClient, db: Session) -> None:
+    user_profile = create_random_user_profile(db)
+    message = create_random_contact_message(db, user_profile)
+    r = client.get(f"{settings.API_V1_STR}/contactus/", params={"limit": 10_000})
+    assert r.status_code == 200
+    messages = [m for m in r.json() if m["message"] == message.message]
+    assert messages == [
+        {
+            "first_name": user_profile.full_name,
+            "last_name": user_profile.last_name,
+            "email": user_profile.email,
+            "phone_number": None,
+            "message": message.message,
+        }
+    ]
+    db.delete(user_profile)
+    db.commit()
+
+
+@pytest.mark.usefixtures("fail_on_repeated_sql")
+def test_get_contact_messages_query_count_is_constant(
+    client: TestClient, db: Session
+) -> None:
+    user_profiles = [create_random_user_profile(db) for _ in range(5)]
+    create_random_contact_message(db, user_profiles[0])
+    params: dict[str, str | int] = {"limit": 10_000}
+    few_messages = count_statements(client, params)
+    for user_profile in user_profiles:
+        create_random_contact_message(db, user_profile)
+    many_messages = count_statements(client, params)
+    assert few_messages == many_messages
+    for user_profile in user_profiles:
+        db.delete(user_profile)
+    db.commit()
+
+
+def test_get_contact_messages_stream(client: TestClient, db: Session) -> None:
+    user_profile = create_random_user_profile(db)
+    message = create_random_contact_message(db, user_profile)
+    params = {"limit": 10_000}
+    r = client.get(
+        f"{settings.API_V1_STR}/contactus/", params={**params, "stream": True}
+    )
+    assert r.status_code == 200
+    assert (
+        r.json()
+        == client.get(f"{settings.API_V1_STR}/contactus/", params=params).json()
+    )
+    assert any(m["message"] == message.message for m in r.json())
+    db.delete(user_profile)
+    db.commit()
+
+
+def test_get_contact_messages_stream_in_chunks(client: TestClient, db: Session) -> None:
+    user_profile = create_random_user_profile(db)
+    messages = [create_random_contact_message(db, user_profile) for _ in range(5)]
+    params = {"limit": 10_000}
+    with patch("app.api.routes.contact_us.STREAM_BATCH_SIZE", 2):
+        r = client.get(
+            f"{settings.API_V1_STR}/contactus/", params={**params, "stream": True}
+        )
+    assert r.status_code == 200
+    streamed = r.json()
+    assert (
+        streamed
+        == client.get(f"{settings.API_V1_STR}/contactus/", params=params).json()
+    )
+    sent = {m["message"] for m in streamed}
+    assert all(message.message in sent for message in messages)
+    db.delete(user_profile)
+    db.commit()
@@ -0,0 +1,251 @@
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.crud import enrollment_crud
+from app.models import OutboundEmail, ResourceType, UserEnrollment
+from app.tests.utils.course import add_chapters, create_random_course
+from app.tests.utils.user_profile import create_random_user_profile
+from app.tests.utils.utils import random_lower_string
+
+
+def statement_count(client: TestClient, url: str) -> int:
+    with patch("app.core.config.settings.SQL_STATS_ENABLED", True):
+        r = client.get(url)
+    assert r.status_code == 200
+    # Server-Timing: db;dur=1.23;desc="7 statements"
+    desc = r.headers["Server-Timing"].split('desc="')[1]
+    return int(desc.split()[0])
+
+
+def test_read_courses(client: TestClient, db: Session) -> None:
+    course = create_random_course(db)
+    r = client.get(f"{settings.API_V1_STR}/courses/", params={"limit": 10_000})
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] >= 1
+    courses = [c for c in content["data"] if c["id"] == str(course.id)]
+    assert len(courses) == 1
+    assert len(courses[0]["authors"]) == 1
+    assert len(courses[0]["prices"]) == 1
+
+
+def test_read_course(client: TestClient, db: Session) -> None:
+    course = create_random_course(db, chapters=2)
+    r = client.get(f"{settings.API_V1_STR}/courses/{course.id}")
+    assert r.status_code == 200
+    content = r.json()
+    assert content["course_name"] == course.course_name
+    assert len(content["chapters"]) == 2
+    assert all(len(chapter["resources"]) == 1 for chapter in content["chapters"])
+    assert len(content["authors"]) == 1
+
+
+def test_read_course_not_found(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/courses/{uuid.uuid4()}")
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Course not found"
+
+
+def test_read_course_query_count_is_constant(client: TestClient, db: Session) -> None:
+    course = create_random_course(db, chapters=1)
+    url = f"{settings.API_V1_STR}/courses/{course.id}"
+    one_chapter = statement_count(client, url)
+    resource_type = db.exec(select(ResourceType)).first()
+    assert resource_type
+    add_chapters(db, course, resource_type, chapters=10)
+    db.commit()
+    assert statement_count(client, url) == one_chapter
+
+
+def test_search_courses_by_prefix(client: TestClient, db: Session) -> None:
+    # Digits make it a numword, which the english config doesn't stem
+    word = f"k8s{uuid.uuid4().hex}"
+    course = create_random_course(db)
+    course.course_name = f"{word} fundamentals"
+    db.add(course)
+    db.commit()
+    r = client.get(f"{settings.API_V1_STR}/courses/search", params={"q": word[:12]})
+    assert r.status_code == 200
+    hits = r.json()["data"]
+    assert [hit["id"] for hit in hits] == [str(course.id)]
+    assert hits[0]["rank"] > 0
+
+
+def test_search_courses_ranks_name_above_description(
+    client: TestClient, db: Session
+) -> None:
+    word = random_lower_string()
+    in_description = create_random_course(db)
+    in_description.description = word
+    in_name = create_random_course(db)
+    in_name.course_name = word
+    db.add_all([in_description, in_name])
+    db.commit()
+    r = client.get(f"{settings.API_V1_STR}/courses/search", params={"q": word})
+    assert r.status_code == 200
+    ids = [hit["id"] for hit in r.json()["data"]]
+    assert ids == [str(in_name.id), str(in_description.id)]
+
+
+def test_search_courses_without_words(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/courses/search", params={"q": "&|!"})
+    assert r.status_code == 200
+    assert r.json()["data"] == []
+
+
+def facet_count(client: TestClient, facet: str, value: str) -> int:
+    r = client.get(f"{settings.API_V1_STR}/courses/facets")
+    assert r.status_code == 200
+    counts: dict[str, int] = {v["value"]: v["count"] for v in r.json()[facet]}
+    return counts.get(value, 0)
+
+
+def test_read_courses_filtered_by_facets(client: TestClient, db: Session) -> None:
+    category = random_lower_string()
+    level = random_lower_string()
+    matching = create_random_course(db)
+    matching.categories = [category, "python"]
+    matching.level = level
+    other_level = create_random_course(db)
+    other_level.categories = [category]
+    db.add_all([matching, other_level])
+    db.commit()
+    r = client.get(
+        f"{settings.API_V1_STR}/courses/",
+        params={"category": [category, "python"], "level": level},
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 1
+    assert [c["id"] for c in content["data"]] == [str(matching.id)]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/courses/",
+        params={"category": category, "price_band": "20_50"},
+    )
+    assert r.status_code == 200
+    assert r.json()["count"] == 2
+
+
+def test_course_facets_follow_course_changes(client: TestClient, db: Session) -> None:
+    category = random_lower_string()
+    course = create_random_course(db)
+    course.categories = [category]
+    db.add(course)
+    db.commit()
+    assert facet_count(client, "category", category) == 1
+
+    other = create_random_course(db)
+    other.categories = [category]
+    db.add(other)
+    db.commit()
+    assert facet_count(client, "category", category) == 2
+
+    course.categories = []
+    db.add(course)
+    db.commit()
+    assert facet_count(client, "category", category) == 1
+
+
+def test_read_course_enrollment_count(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    course = create_random_course(db)
+    enrollment_crud.increment_enrollment_counts(session=db, counts={course.id: 4})
+    db.commit()
+    url = f"{settings.API_V1_STR}/courses/{course.id}/enrollment-count"
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.status_code == 200
+    assert r.json() == {
+        "course_id": str(course.id),
+        "folded": 0,
+        "pending": 4,
+        "exact": 4,
+    }
+    # The catalog shows the folded count only
+    r = client.get(f"{settings.API_V1_STR}/courses/{course.id}")
+    assert r.json()["enrollment_count"] == 0
+
+    enrollment_crud.fold_enrollment_counts(session=db)
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.json()["folded"] == 4
+    assert r.json()["exact"] == 4
+
+
+def test_read_course_enrollment_count_not_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    course = create_random_course(db)
+    r = client.get(
+        f"{settings.API_V1_STR}/courses/{course.id}/enrollment-count",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_read_course_not_modified(client: TestClient, db: Session) -> None:
+    course = create_random_course(db)
+    url = f"{settings.API_V1_STR}/courses/{course.id}"
+    r = client.get(url)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    r = client.get(url, headers={"If-None-Match": f'"other", {etag}'})
+    assert r.status_code == 304
+
+
+def test_announce_course(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    course = create_random_course(db)
+    learners = [create_random_user_profile(db) for _ in range(2)]
+    not_enrolled = create_random_user_profile(db)
+    db.add_all(
+        UserEnrollment(user_id=learner.id, course_id=course.id) for learner in learners
+    )
+    db.commit()
+    with patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"):
+        r = client.post(
+            f"{settings.API_V1_STR}/courses/{course.id}/announcements",
+            headers=superuser_token_headers,
+            json={"subject": "Launch", "message": "The first chapter is out"},
+        )
+    assert r.status_code == 201
+    assert r.json() == {"message": "Queued 2 emails"}
+    recipients = [learner.email for learner in [*learners, not_enrolled]]
+    queued = db.exec(
+        select(OutboundEmail).where(col(OutboundEmail.email_to).in_(recipients))
+    ).all()
+    assert sorted(email.email_to for email in queued) == sorted(
+        learner.email for learner in learners
+    )
+    for email in queued:
+        assert email.subject.endswith(f"{course.course_name}: Launch")
+        assert email.html_content and "The first chapter is out" in email.html_content
+
+
+def test_announce_course_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"):
+        r = client.post(
+            f"{settings.API_V1_STR}/courses/{uuid.uuid4()}/announcements",
+            headers=superuser_token_headers,
+            json={"subject": "Launch", "message": "Soon"},
+        )
+    assert r.status_code == 404
+
+
+def test_announce_course_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    course = create_random_course(db)
+    r = client.post(
+        f"{settings.API_V1_STR}/courses/{course.id}/announcements",
+        headers=normal_user_token_headers,
+        json={"subject": "Launch", "message": "Soon"},
+    )
+    assert r.status_code == 403
@@ -0,0 +1,98 @@
+import csv
+import io
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.models import CourseEnrollmentCounter, UserEnrollment
+from app.tests.utils.course import create_random_course
+from app.tests.utils.user_profile import create_random_user_profile
+
+
+def test_bulk_enroll(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    course = create_random_course(db)
+    users = [create_random_user_profile(db) for _ in range(3)]
+    db.add(UserEnrollment(user_id=users[0].id, course_id=course.id))
+    db.commit()
+    unknown = uuid.uuid4()
+    pairs = [
+        (users[0].id, course.id),
+        (users[1].id, course.id),
+        (users[2].id, course.id),
+        (users[1].id, course.id),
+        (unknown, course.id),
+        (users[2].id, unknown),
+    ]
+    r = client.post(
+        f"{settings.API_V1_STR}/enrollments/bulk",
+        headers=superuser_token_headers,
+        json={
+            "items": [
+                {"user_id": str(user_id), "course_id": str(course_id)}
+                for user_id, course_id in pairs
+            ]
+        },
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["enrolled"] == 2
+    assert [row["outcome"] for row in content["data"]] == [
+        "already_enrolled",
+        "enrolled",
+        "enrolled",
+        "duplicate",
+        "unknown_user",
+        "unknown_course",
+    ]
+    enrollments = db.exec(
+        select(func.count())
+        .select_from(UserEnrollment)
+        .where(UserEnrollment.course_id == course.id)
+    ).one()
+    assert enrollments == 3
+    pending = db.exec(
+        select(func.sum(CourseEnrollmentCounter.count)).where(
+            CourseEnrollmentCounter.course_id == course.id
+        )
+    ).one()
+    assert pending == 2
+
+
+def test_bulk_enroll_not_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/enrollments/bulk",
+        headers=normal_user_token_headers,
+        json={
+            "items": [{"user_id": str(uuid.uuid4()), "course_id": str(uuid.uuid4())}]
+        },
+    )
+    assert r.status_code == 403
+
+
+def test_export_enrollments_csv(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    course = create_random_course(db)
+    user = create_random_user_profile(db)
+    db.add(UserEnrollment(user_id=user.id, course_id=course.id, status="active"))
+    db.commit()
+    r = client.get(
+        f"{settings.API_V1_STR}/enrollments/export",
+        headers=superuser_token_headers,
+        params={"format": "csv"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-disposition"] == (
+        'attachment; filename="enrollments.csv"'
+    )
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    exported = [row for row in rows if row["course_id"] == str(course.id)]
+    assert len(exported) == 1
+    assert exported[0]["user_id"] == str(user.id)
+    assert exported[0]["status"] == "active"
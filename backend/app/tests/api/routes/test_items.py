@@ -1,3 +1,4 @@
+import json
 import uuid
 
 from fastapi.testclient import TestClient
@@ -79,6 +80,49 @@ def test_read_items(
     assert len(content["data"]) >= 2
 
 
+def test_read_items_with_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "include_count": False},
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert first_page["count"] is None
+    assert len(first_page["data"]) == 2
+    assert first_page["next_cursor"]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert second_page["count"] >= 3
+    first_ids = [item["id"] for item in first_page["data"]]
+    second_ids = [item["id"] for item in second_page["data"]]
+    assert second_ids
+    assert not set(first_ids) & set(second_ids)
+    assert max(first_ids) < min(second_ids)
+
+
+def test_read_items_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
 def test_update_item(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -162,3 +206,142 @@ def test_delete_item_not_enough_permissions(
     assert response.status_code == 400
     content = response.json()
     assert content["detail"] == "Not enough permissions"
+
+
+def test_create_items_bulk(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    data = [{"title": f"Foo {i}", "description": "Fighters"} for i in range(25)]
+    response = client.post(
+        f"{settings.API_V1_STR}/items/bulk",
+        headers=superuser_token_headers,
+        json={"data": data},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 25
+    assert [item["title"] for item in content["data"]] == [d["title"] for d in data]
+    assert len({item["id"] for item in content["data"]}) == 25
+
+
+def test_update_items_bulk(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    first = create_random_item(db)
+    second = create_random_item(db)
+    response = client.put(
+        f"{settings.API_V1_STR}/items/bulk",
+        headers=superuser_token_headers,
+        json={
+            "data": [
+                {"id": str(second.id), "description": "Only description"},
+                {"id": str(first.id), "title": "Updated", "description": None},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [item["id"] for item in content["data"]] == [str(second.id), str(first.id)]
+    assert content["data"][0]["title"] == second.title
+    assert content["data"][0]["description"] == "Only description"
+    assert content["data"][1]["title"] == "Updated"
+    assert content["data"][1]["description"] is None
+
+
+def test_update_items_bulk_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    response = client.put(
+        f"{settings.API_V1_STR}/items/bulk",
+        headers=normal_user_token_headers,
+        json={"data": [{"id": str(item.id), "title": "Updated"}]},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
+    db.refresh(item)
+    assert item.title != "Updated"
+
+
+def test_update_items_bulk_duplicate_ids(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    response = client.put(
+        f"{settings.API_V1_STR}/items/bulk",
+        headers=superuser_token_headers,
+        json={"data": [{"id": str(item.id)}, {"id": str(item.id), "title": "Foo"}]},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Duplicate item ids"
+
+
+def test_delete_items_bulk(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    items = [create_random_item(db) for _ in range(3)]
+    response = client.request(
+        "DELETE",
+        f"{settings.API_V1_STR}/items/bulk",
+        headers=superuser_token_headers,
+        json={"ids": [str(item.id) for item in items]},
+    )
+    assert response.status_code == 200
+    assert response.json()["message"] == "3 items deleted successfully"
+
+
+def test_delete_items_bulk_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    missing = uuid.uuid4()
+    response = client.request(
+        "DELETE",
+        f"{settings.API_V1_STR}/items/bulk",
+        headers=superuser_token_headers,
+        json={"ids": [str(item.id), str(missing)]},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Item {missing} not found"
+
+
+def test_export_items_only_own(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    other = create_random_item(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/items/",
+        headers=normal_user_token_headers,
+        json={"title": "Exported"},
+    )
+    own = response.json()
+    response = client.get(
+        f"{settings.API_V1_STR}/items/export", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    ids = [json.loads(line)["id"] for line in response.text.splitlines()]
+    assert own["id"] in ids
+    assert str(other.id) not in ids
+
+
+def test_read_item_not_modified(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/{item.id}"
+    response = client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    not_modified_headers = {**superuser_token_headers, "If-None-Match": etag}
+    response = client.get(url, headers=not_modified_headers)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    client.put(url, headers=superuser_token_headers, json={"title": "Changed"})
+    response = client.get(url, headers=not_modified_headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["title"] == "Changed"
@@ -1,10 +1,13 @@
 from unittest.mock import patch
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
+from starlette.types import Receive, Scope, Send
 
 from app.core.config import settings
 from app.core.security import verify_password
+from app.main import app
 from app.models import User
 from app.utils import generate_password_reset_token
 
@@ -69,6 +72,7 @@ def test_recovery_password_user_not_exits(
     assert r.status_code == 404
 
 
+@pytest.mark.usefixtures("restore_superuser_password")
 def test_reset_password(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -102,3 +106,69 @@ def test_reset_password_invalid_token(
     assert "detail" in response
     assert r.status_code == 400
     assert response["detail"] == "Invalid token"
+
+
+@pytest.mark.usefixtures("rate_limited")
+def test_get_access_token_rate_limited(client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/login/access-token"
+    login_data = {"username": "stuffed@example.com", "password": "wrong"}
+    with patch("app.crud.async_user_item_crud.authenticate") as authenticate:
+        authenticate.return_value = None
+        for _ in range(settings.LOGIN_RATE_LIMIT_PER_EMAIL):
+            r = client.post(url, data=login_data)
+            assert r.status_code == 400
+        calls = authenticate.call_count
+        r = client.post(url, data=login_data)
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) >= 1
+    assert authenticate.call_count == calls
+
+
+@pytest.mark.usefixtures("rate_limited")
+def test_recovery_password_rate_limited(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/password-recovery/nobody@example.com"
+    for _ in range(settings.PASSWORD_RECOVERY_RATE_LIMIT_PER_EMAIL):
+        r = client.post(url, headers=normal_user_token_headers)
+        assert r.status_code == 404
+    r = client.post(url, headers=normal_user_token_headers)
+    assert r.status_code == 429
+
+
+async def behind_proxy(scope: Scope, receive: Receive, send: Send) -> None:
+    # Every request reaches the app from Traefik's address
+    scope["client"] = ("10.0.0.2", 41234)
+    await app(scope, receive, send)
+
+
+@pytest.mark.usefixtures("rate_limited")
+def test_get_access_token_rate_limited_per_forwarded_ip() -> None:
+    url = f"{settings.API_V1_STR}/login/access-token"
+    proxied = TestClient(behind_proxy)
+    with (
+        patch("app.core.config.settings.TRUSTED_PROXIES", ["10.0.0.0/8"]),
+        patch("app.core.config.settings.LOGIN_RATE_LIMIT_PER_IP", 2),
+        patch("app.crud.async_user_item_crud.authenticate", return_value=None),
+    ):
+        for index in range(2):
+            r = proxied.post(
+                url,
+                data={"username": f"a{index}@example.com", "password": "wrong"},
+                headers={"X-Forwarded-For": "203.0.113.1"},
+            )
+            assert r.status_code == 400
+        # Prepending a made up hop doesn't escape the IP Traefik saw
+        r = proxied.post(
+            url,
+            data={"username": "a2@example.com", "password": "wrong"},
+            headers={"X-Forwarded-For": "198.51.100.7, 203.0.113.1"},
+        )
+        assert r.status_code == 429
+        # Another client behind the same proxy still gets its own bucket
+        r = proxied.post(
+            url,
+            data={"username": "b@example.com", "password": "wrong"},
+            headers={"X-Forwarded-For": "203.0.113.2"},
+        )
+        assert r.status_code == 400
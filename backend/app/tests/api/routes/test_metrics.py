@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_metrics_superuser_only(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get("/metrics")
+    assert r.status_code == 401
+    r = client.get("/metrics", headers=normal_user_token_headers)
+    assert r.status_code == 403
+
+
+def test_metrics(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    r = client.get("/metrics", headers=superuser_token_headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="items-read_items",'
+        'status="200"}' in r.text
+    )
+    assert 'http_requests_in_progress{method="GET"}' in r.text
+    assert 'db_statement_duration_seconds_count{pool="primary' in r.text
+    assert 'db_pool_checked_out{pool="primary"}' in r.text
+    assert 'db_pool_size{pool="primary"}' in r.text
+    assert "password_hash_queue_depth" in r.text
+
+
+def test_metrics_unmatched_route(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    client.get("/no-such-page")
+    r = client.get("/metrics", headers=superuser_token_headers)
+    assert 'route="unmatched",status="404"' in r.text
+
+
+def test_metrics_disabled(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.METRICS_ENABLED", False):
+        r = client.get("/metrics", headers=superuser_token_headers)
+    assert r.status_code == 404
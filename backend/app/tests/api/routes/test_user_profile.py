@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.crud import user_profile_crud
+from app.tests.utils.user_profile import create_random_user_profile, random_gmail
+
+
+def test_get_user_profile_not_modified(client: TestClient, db: Session) -> None:
+    user_profile = create_random_user_profile(db)
+    url = f"{settings.API_V1_STR}/user_profile/{user_profile.email}"
+    r = client.get(url)
+    assert r.status_code == 200
+    assert r.json()["email"] == user_profile.email
+    etag = r.headers["ETag"]
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+
+@pytest.mark.usefixtures("rate_limited")
+def test_sign_in_rate_limited(client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/user_profile/sign_in"
+    body = {"email": "stuffed@gmail.com", "password": "wrongpassword"}
+    for _ in range(settings.LOGIN_RATE_LIMIT_PER_EMAIL):
+        r = client.post(url, json=body)
+        assert r.status_code == 401
+    r = client.post(url, json=body)
+    assert r.status_code == 429
+
+
+def test_sign_up_and_sign_in(client: TestClient, db: Session) -> None:
+    email = random_gmail()
+    r = client.post(
+        f"{settings.API_V1_STR}/user_profile/sign_up",
+        json={"full_name": "Ada", "email": email, "password": "secretpass"},
+    )
+    assert r.status_code == 201
+    assert "password" not in r.json()
+    user_profile = user_profile_crud.get_user_profile_by_email(session=db, email=email)
+    assert user_profile
+    assert user_profile.password is None
+    assert user_profile.hashed_password != "secretpass"
+
+    url = f"{settings.API_V1_STR}/user_profile/sign_in"
+    r = client.post(url, json={"email": email, "password": "secretpass"})
+    assert r.status_code == 200
+    r = client.post(url, json={"email": email, "password": "wrongpassword"})
+    assert r.status_code == 401
@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 import uuid
 from unittest.mock import patch
 
@@ -8,6 +11,7 @@ from app import crud
 from app.core.config import settings
 from app.core.security import verify_password
 from app.models import User, UserCreate
+from app.tests.utils.user import user_authentication_headers
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -166,6 +170,35 @@ def test_retrieve_users(
     assert "count" in all_users
     for item in all_users["data"]:
         assert "email" in item
+        assert "hashed_password" not in item
+
+
+def test_retrieve_users_with_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        user_in = UserCreate(email=random_email(), password=random_lower_string())
+        crud.create_user(session=db, user_create=user_in)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "include_count": False},
+    )
+    first_page = r.json()
+    assert first_page["count"] is None
+    assert first_page["next_cursor"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+    )
+    second_page = r.json()
+    first_ids = {user["id"] for user in first_page["data"]}
+    second_ids = {user["id"] for user in second_page["data"]}
+    assert second_ids
+    assert not first_ids & second_ids
 
 
 def test_update_user_me(
@@ -484,3 +517,123 @@ def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_read_user_me_after_update_is_not_stale(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    full_name = random_lower_string()
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/me",
+        headers=normal_user_token_headers,
+        json={"full_name": full_name},
+    )
+    assert r.status_code == 200
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.json()["full_name"] == full_name
+
+
+def cached_user_headers(client: TestClient, db: Session) -> tuple[User, dict[str, str]]:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+    return user, headers
+
+
+def test_update_user_me_deactivated_elsewhere(client: TestClient, db: Session) -> None:
+    # Changed by another worker, this worker's cached snapshot is still active
+    user, headers = cached_user_headers(client, db)
+    user.is_active = False
+    db.add(user)
+    db.commit()
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/me",
+        headers=headers,
+        json={"full_name": random_lower_string()},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Inactive user"
+
+
+def test_update_user_me_deleted_elsewhere(client: TestClient, db: Session) -> None:
+    user, headers = cached_user_headers(client, db)
+    db.delete(user)
+    db.commit()
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/me",
+        headers=headers,
+        json={"full_name": random_lower_string()},
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "User not found"
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 404
+
+
+def test_export_users_ndjson(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    user = crud.create_user(session=db, user_create=user_in)
+    r = client.get(
+        f"{settings.API_V1_STR}/users/export", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    exported = [row for row in rows if row["id"] == str(user.id)]
+    assert exported == [
+        {
+            "email": user.email,
+            "is_active": True,
+            "is_superuser": False,
+            "full_name": None,
+            "id": str(user.id),
+        }
+    ]
+    assert all("hashed_password" not in row for row in rows)
+
+
+def test_export_users_csv(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    user = crud.create_user(session=db, user_create=user_in)
+    r = client.get(
+        f"{settings.API_V1_STR}/users/export",
+        headers=superuser_token_headers,
+        params={"format": "csv"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    exported = [row for row in rows if row["id"] == str(user.id)]
+    assert len(exported) == 1
+    assert exported[0]["email"] == user.email
+    assert exported[0]["full_name"] == ""
+
+
+def test_export_users_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/export", headers=normal_user_token_headers
+    )
+    assert r.status_code == 403
+
+
+def test_read_user_me_not_modified(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/users/me"
+    r = client.get(url, headers=normal_user_token_headers)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    r = client.get(url, headers={**normal_user_token_headers, "If-None-Match": etag})
+    assert r.status_code == 304
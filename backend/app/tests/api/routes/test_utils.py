@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_read_db_pool_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    pools = {pool["name"]: pool for pool in r.json()["data"]}
+    assert set(pools) == {"primary", "primary_async"}
+    primary = pools["primary"]
+    assert primary["size"] == settings.DB_POOL_SIZE
+    assert primary["checkouts"] > 0
+    assert primary["wait_seconds_max"] >= 0
+
+
+def test_read_db_pool_status_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=normal_user_token_headers
+    )
+    assert r.status_code == 403
+
+
+def test_read_caches_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/caches/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    caches = {cache["name"]: cache for cache in r.json()["data"]}
+    assert set(caches) == {"token", "user", "compression"}
+    assert caches["token"]["hits"] > 0
+    assert caches["user"]["size"] > 0
+
+
+def test_read_password_hashing_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/password-hashing/",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["executor"] == settings.PASSWORD_HASH_EXECUTOR
+    assert content["concurrency"] == settings.PASSWORD_HASH_CONCURRENCY
+    assert content["queue_depth"] == 0
+
+
+def test_read_email_queue_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/email-queue/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["pending"] >= 0
+    assert content["failed"] >= 0
+    assert content["send_seconds_max"] >= 0
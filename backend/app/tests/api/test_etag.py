@@ -0,0 +1,11 @@
+from app.api.etag import etag_matches, make_etag
+
+
+def test_etag_matches_weakly() -> None:
+    etag = make_etag(b'{"id": 1}')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(make_etag(b'{"id": 2}'), etag)
@@ -0,0 +1,105 @@
+import time
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiling import StackSampler, read_profile
+
+
+@pytest.fixture
+def profiling_enabled(tmp_path: Path) -> Generator[None, None, None]:
+    with (
+        patch("app.core.config.settings.PROFILING_ENABLED", True),
+        patch("app.core.config.settings.PROFILING_DIR", str(tmp_path)),
+    ):
+        yield
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_folds_stacks() -> None:
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    busy_wait(0.05)
+    sampler.stop()
+    folded = sampler.folded()
+    assert "busy_wait (" in folded
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert stack.split(";")[0]
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+def test_profile_request(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/contactus/",
+        headers={**superuser_token_headers, "X-Profile": "1"},
+    )
+    assert r.status_code == 200
+    profile_id = r.headers["X-Profile-Id"]
+    assert "contactus-get_by_contact_message" in profile_id
+
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/profiles/{profile_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.text == read_profile(profile_id)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in r.text.splitlines())
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+def test_profile_query_flag(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/items/?_profile=1", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert "X-Profile-Id" in r.headers
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+def test_profile_requires_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers={**normal_user_token_headers, "X-Profile": "1"},
+    )
+    assert r.status_code == 200
+    assert "X-Profile-Id" not in r.headers
+    r = client.get(f"{settings.API_V1_STR}/contactus/", headers={"X-Profile": "1"})
+    assert "X-Profile-Id" not in r.headers
+
+
+def test_profile_disabled(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers={**superuser_token_headers, "X-Profile": "1"},
+    )
+    assert "X-Profile-Id" not in r.headers
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+def test_read_profile_rejects_paths(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    assert read_profile("../etc/passwd") is None
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/profiles/missing",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
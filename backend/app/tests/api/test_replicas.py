@@ -0,0 +1,50 @@
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.db import engine, replica_router
+
+
+@pytest.fixture
+def one_replica(client: TestClient) -> Generator[None, None, None]:
+    # The primary stands in for the replica, only the routing is under test
+    with (
+        patch.object(replica_router, "engines", [engine]),
+        patch.object(replica_router, "_healthy", [True]),
+        patch.object(replica_router, "_checked_at", [float("inf")]),
+        patch("app.api.deps.replica_engines", [engine]),
+    ):
+        client.cookies.clear()
+        yield
+        client.cookies.clear()
+
+
+@pytest.mark.usefixtures("one_replica")
+def test_write_cookie_sends_later_reads_to_primary(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    me = client.get(
+        f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers
+    )
+    url = f"{settings.API_V1_STR}/users/{me.json()['id']}"
+    with patch.object(replica_router, "choose", wraps=replica_router.choose) as choose:
+        client.get(url, headers=normal_user_token_headers)
+    assert choose.call_args.args == (None,)
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/me",
+        headers=normal_user_token_headers,
+        json={"full_name": me.json()["full_name"]},
+    )
+    assert r.status_code == 200
+    assert "last_write" in r.cookies
+
+    # Whichever worker serves the read sees the write in the cookie
+    with patch.object(replica_router, "choose", wraps=replica_router.choose) as choose:
+        r = client.get(url, headers=normal_user_token_headers)
+    assert r.status_code == 200
+    (written_at,) = choose.call_args.args
+    assert replica_router.is_sticky(written_at)
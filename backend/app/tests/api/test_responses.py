@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.api.responses import PydanticJSONResponse
+
+
+def test_renders_like_json_response() -> None:
+    content = {"data": [{"title": "Grüße", "count": 3, "ok": True, "none": None}]}
+    assert PydanticJSONResponse(content).body == JSONResponse(content).body
+
+
+def test_renders_non_json_types() -> None:
+    id = uuid.uuid4()
+    content = {"id": id, "at": datetime(2024, 1, 2, 3, 4, 5), "price": Decimal("9.50")}
+    body = PydanticJSONResponse(content).body
+    assert body == (
+        f'{{"id":"{id}","at":"2024-01-02T03:04:05","price":"9.50"}}'.encode()
+    )
+
+
+def test_renders_non_finite_floats_as_null() -> None:
+    content = {"nan": float("nan"), "inf": float("inf")}
+    assert PydanticJSONResponse(content).body == b'{"nan":null,"inf":null}'
+
+
+def test_renders_model_with_its_serializer() -> None:
+    class Public(BaseModel):
+        id: uuid.UUID
+
+    class Private(Public):
+        secret: str
+
+    class Page(BaseModel):
+        data: list[Public]
+
+    id = uuid.uuid4()
+    page = Page(data=[Private(id=id, secret="x")])
+    assert PydanticJSONResponse(page).body == f'{{"data":[{{"id":"{id}"}}]}}'.encode()
@@ -1,29 +1,109 @@
 from collections.abc import Generator
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
+from app import crud
 from app.core.config import settings
 from app.core.db import engine, init_db
+from app.core.rate_limit import MemoryBackend
 from app.main import app
-from app.models import Item, User
+from app.models import (
+    Author,
+    ContactMessage,
+    Course,
+    CourseAuthorLink,
+    CourseChapter,
+    CourseEnrollmentCounter,
+    CourseResource,
+    Item,
+    OutboundEmail,
+    Price,
+    RateLimitBucket,
+    ResourceType,
+    Thumbnail,
+    User,
+    UserEnrollment,
+    UserProfile,
+    UserUpdate,
+)
+from app.tests.utils.smtp import SMTPServer, smtp_server
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
+# Rows the tests leave behind, children before the rows they reference. Course
+# facets and their counts follow course and price through database triggers
+TEARDOWN_ORDER = (
+    UserEnrollment,
+    CourseEnrollmentCounter,
+    CourseResource,
+    CourseChapter,
+    CourseAuthorLink,
+    Thumbnail,
+    Price,
+    Course,
+    Author,
+    ResourceType,
+    UserProfile,
+    ContactMessage,
+    OutboundEmail,
+    RateLimitBucket,
+    Item,
+    User,
+)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         init_db(session)
         yield session
-        statement = delete(Item)
-        session.execute(statement)
-        statement = delete(User)
-        session.execute(statement)
+        for model in TEARDOWN_ORDER:
+            statement = delete(model)
+            session.execute(statement)
         session.commit()
 
 
+@pytest.fixture
+def restore_superuser_password(db: Session) -> Generator[None, None, None]:
+    """
+    Put the superuser's password back after a test that changes it, later
+    modules log in with FIRST_SUPERUSER_PASSWORD.
+    """
+    yield
+    superuser = crud.get_user_by_email(session=db, email=settings.FIRST_SUPERUSER)
+    assert superuser
+    crud.update_user(
+        session=db,
+        db_user=superuser,
+        user_in=UserUpdate(password=settings.FIRST_SUPERUSER_PASSWORD),
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def rate_limit_disabled() -> Generator[None, None, None]:
+    """
+    Tests log in far more often than the limits allow, the limiter has its own.
+    """
+    with patch("app.core.config.settings.RATE_LIMIT_ENABLED", False):
+        yield
+
+
+@pytest.fixture
+def rate_limited() -> Generator[None, None, None]:
+    """
+    Enable rate limiting for one test, with fresh in-memory buckets.
+    """
+    with (
+        patch("app.core.config.settings.RATE_LIMIT_ENABLED", True),
+        patch("app.core.config.settings.RATE_LIMIT_BACKEND", "memory"),
+        patch("app.core.rate_limit._backend", MemoryBackend(max_keys=1000)),
+    ):
+        yield
+
+
 @pytest.fixture(scope="module")
 def client() -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
@@ -40,3 +120,41 @@ def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]
     return authentication_token_from_email(
         client=client, email=settings.EMAIL_TEST_USER, db=db
     )
+
+
+@pytest.fixture
+def server() -> Generator[SMTPServer, None, None]:
+    """
+    Local stand-in SMTP server that accepts and counts every message.
+    """
+    with smtp_server() as server:
+        yield server
+
+
+@pytest.fixture
+def smtp_settings(server: SMTPServer) -> Generator[None, None, None]:
+    """
+    Point the mailer at the stand-in server, without TLS, login or pacing.
+    """
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "127.0.0.1"),
+        patch("app.core.config.settings.SMTP_PORT", server.server_address[1]),
+        patch("app.core.config.settings.SMTP_TLS", False),
+        patch("app.core.config.settings.SMTP_SSL", False),
+        patch("app.core.config.settings.SMTP_USER", None),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "admin@example.com"),
+        patch("app.core.config.settings.SMTP_RATE_LIMIT", 0),
+    ):
+        yield
+
+
+@pytest.fixture
+def fail_on_repeated_sql() -> Generator[None, None, None]:
+    """
+    Fail any request in the test that repeats one statement past SQL_REPEAT_THRESHOLD.
+    """
+    with (
+        patch("app.core.config.settings.SQL_STATS_ENABLED", True),
+        patch("app.core.sql_stats.raise_on_repeat", True),
+    ):
+        yield
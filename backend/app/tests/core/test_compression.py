@@ -0,0 +1,112 @@
+import gzip
+from unittest.mock import patch
+
+import brotli  # type: ignore[import-untyped]
+import zstandard
+from fastapi.testclient import TestClient
+
+from app.core.compression import (
+    compress,
+    compress_cached,
+    compression_cache,
+    negotiate,
+    stream_encoder,
+)
+from app.core.config import settings
+
+
+def test_negotiate_prefers_highest_quality() -> None:
+    assert negotiate("gzip") == "gzip"
+    assert negotiate("deflate, gzip;q=0.5") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("identity") is None
+    assert negotiate("") is None
+
+
+def test_negotiate_prefers_br_then_zstd() -> None:
+    assert negotiate("gzip, zstd, br") == "br"
+    assert negotiate("gzip, zstd") == "zstd"
+    assert negotiate("br;q=0.5, gzip") == "gzip"
+
+
+def test_compress_round_trips() -> None:
+    body = b'{"data": []}' * 200
+    assert brotli.decompress(compress("br", body)) == body
+    assert zstandard.ZstdDecompressor().decompress(compress("zstd", body)) == body
+    assert gzip.decompress(compress("gzip", body)) == body
+
+
+def test_stream_encoders_round_trip() -> None:
+    chunks = [b'{"id": 1}\n' * 50, b'{"id": 2}\n' * 50]
+    decoders = {
+        "br": brotli.decompress,
+        "zstd": lambda data: zstandard.ZstdDecompressor()
+        .decompressobj()
+        .decompress(data),
+        "gzip": gzip.decompress,
+    }
+    for encoding, decode in decoders.items():
+        encoder = stream_encoder(encoding)
+        encoded = b"".join(encoder.chunk(chunk) for chunk in chunks)
+        encoded += encoder.finish()
+        assert decode(encoded) == b"".join(chunks)
+
+
+def test_compress_cached_reuses_identical_bodies() -> None:
+    body = b'{"data": []}' * 200
+    compressed = compress_cached("gzip", body)
+    hits = compression_cache.hits
+    assert compress_cached("gzip", body) is compressed
+    assert compression_cache.hits == hits + 1
+    assert gzip.decompress(compressed) == body
+
+
+def test_compresses_large_get_response(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.COMPRESSION_MIN_SIZE", 0):
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers={**superuser_token_headers, "Accept-Encoding": "gzip"},
+        )
+    assert r.status_code == 200
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert r.json()["count"] >= 1
+
+
+def test_skips_small_response(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.COMPRESSION_MIN_SIZE", 10_000_000):
+        r = client.get(
+            f"{settings.API_V1_STR}/users/me",
+            headers={**superuser_token_headers, "Accept-Encoding": "gzip"},
+        )
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
+
+
+def test_compresses_streamed_response(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/export",
+        headers={**superuser_token_headers, "Accept-Encoding": "gzip"},
+    )
+    assert r.status_code == 200
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in r.headers
+    assert settings.FIRST_SUPERUSER in r.text
+
+
+def test_compresses_with_brotli(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.COMPRESSION_MIN_SIZE", 0):
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers={**superuser_token_headers, "Accept-Encoding": "br, gzip"},
+        )
+    assert r.status_code == 200
+    assert r.headers["Content-Encoding"] == "br"
@@ -0,0 +1,154 @@
+from collections.abc import Generator
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import Session, col, select
+
+from app.core import email_queue
+from app.core.config import settings
+from app.core.smtp import SMTPMailer
+from app.crud import email_crud
+from app.models import OutboundEmail
+from app.tests.utils.smtp import SMTPServer
+from app.utils import (
+    deliver_email,
+    generate_course_announcement_emails,
+    send_email,
+    send_emails,
+)
+
+
+@pytest.fixture
+def emails_enabled() -> Generator[None, None, None]:
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "admin@example.com"),
+    ):
+        yield
+
+
+def queued_email(db: Session) -> OutboundEmail:
+    return email_crud.enqueue_email(
+        session=db, email_to="to@example.com", subject="Hi", html_content="<p>Hi</p>"
+    )
+
+
+@pytest.mark.usefixtures("emails_enabled")
+def test_send_email_only_enqueues(db: Session) -> None:
+    with patch("app.utils.deliver_email") as deliver:
+        send_email(email_to="queued@example.com", subject="Queued")
+    deliver.assert_not_called()
+    pending, _, oldest = email_crud.get_queue_counts(session=db)
+    assert pending >= 1
+    assert oldest is not None
+
+
+def test_process_due_emails_sends(db: Session) -> None:
+    email = queued_email(db)
+    sent = []
+    sent_before = email_queue.metrics.sent
+    email_queue.process_due_emails(
+        session=db, deliver=lambda **kwargs: sent.append(kwargs["email_to"])
+    )
+    db.refresh(email)
+    assert email.status == email_crud.SENT
+    assert email.attempts == 1
+    assert email.sent_at is not None
+    assert email.html_content is None
+    assert "to@example.com" in sent
+    assert email_queue.metrics.sent > sent_before
+
+
+def test_process_due_emails_retries_with_backoff(db: Session) -> None:
+    email = queued_email(db)
+
+    def fail(**_kwargs: str) -> None:
+        raise ConnectionError("relay down")
+
+    email_queue.process_due_emails(session=db, deliver=fail)
+    db.refresh(email)
+    assert email.status == email_crud.PENDING
+    assert email.attempts == 1
+    assert email.last_error == "relay down"
+    assert email.next_attempt_at > datetime.utcnow()
+
+
+def test_process_due_emails_gives_up(db: Session) -> None:
+    email = queued_email(db)
+    email.attempts = settings.EMAIL_MAX_ATTEMPTS - 1
+    db.add(email)
+    db.commit()
+
+    def fail(**_kwargs: str) -> None:
+        raise ConnectionError("relay down")
+
+    email_queue.process_due_emails(session=db, deliver=fail)
+    db.refresh(email)
+    assert email.status == email_crud.FAILED
+    assert email.html_content is None
+
+
+def test_retry_delay_grows_and_is_capped() -> None:
+    first = email_queue.retry_delay(1)
+    assert first is not None and first <= settings.EMAIL_RETRY_BASE_SECONDS
+    third = email_queue.retry_delay(3)
+    assert third is not None and third > settings.EMAIL_RETRY_BASE_SECONDS
+    assert email_queue.retry_delay(settings.EMAIL_MAX_ATTEMPTS) is None
+    with patch("app.core.config.settings.EMAIL_MAX_ATTEMPTS", 100):
+        capped = email_queue.retry_delay(50)
+    assert capped is not None and capped <= settings.EMAIL_RETRY_MAX_SECONDS
+
+
+def test_prune_emails_keeps_pending_and_recent(db: Session) -> None:
+    old_sent, old_pending, recent_sent = (queued_email(db) for _ in range(3))
+    for email in (old_sent, recent_sent):
+        email_crud.mark_sent(email=email)
+    for email in (old_sent, old_pending):
+        email.created_at = datetime.utcnow() - timedelta(hours=2)
+    db.add_all([old_sent, old_pending, recent_sent])
+    db.commit()
+    ids = {email.id for email in (old_sent, old_pending, recent_sent)}
+
+    assert email_crud.prune_emails(session=db, older_than_hours=1) >= 1
+    db.expire_all()
+    remaining = {email_id for email_id in ids if db.get(OutboundEmail, email_id)}
+    assert remaining == {old_pending.id, recent_sent.id}
+
+
+@pytest.mark.usefixtures("smtp_settings")
+def test_announcement_queued_in_one_insert_and_sent_in_batches(
+    db: Session, server: SMTPServer
+) -> None:
+    learners = [
+        (f"learner{index}@example.com", f"Learner {index}") for index in range(5)
+    ]
+    messages = generate_course_announcement_emails(
+        course_name="Algebra", learners=learners, subject="Launch", message="<b>Mon</b>"
+    )
+    assert send_emails(messages) == 5
+    statement = select(OutboundEmail).where(
+        col(OutboundEmail.email_to).in_([email for email, _ in learners])
+    )
+    queued = db.exec(statement).all()
+    assert len(queued) == 5
+    for email in queued:
+        assert email.status == email_crud.PENDING
+        assert email.html_content
+        assert "&lt;b&gt;Mon&lt;/b&gt;" in email.html_content
+
+    batches = []
+    with (
+        patch("app.core.config.settings.EMAIL_QUEUE_BATCH_SIZE", 2),
+        patch("app.utils.mailer", SMTPMailer()) as mailer,
+    ):
+        while tried := email_queue.process_due_emails(
+            session=db, deliver=deliver_email
+        ):
+            batches.append(tried)
+        mailer.close()
+    assert max(batches) == 2
+    assert server.messages == sum(batches)
+    assert server.connections == 1
+    db.expire_all()
+    assert all(email.status == email_crud.SENT for email in db.exec(statement))
@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.utils import (
+    email_templates,
+    generate_test_email,
+    render_email_template,
+    render_email_templates,
+)
+
+
+def test_render_email_template() -> None:
+    html_content = render_email_template(
+        template_name="test_email.html",
+        context={"project_name": "LMS", "email": "to@example.com"},
+    )
+    assert "to@example.com" in html_content
+
+
+def test_templates_compiled_once() -> None:
+    generate_test_email(email_to="first@example.com")
+    with patch.object(
+        email_templates, "_parse", side_effect=AssertionError("recompiled")
+    ):
+        email_data = generate_test_email(email_to="second@example.com")
+    assert "second@example.com" in email_data.html_content
+    assert settings.PROJECT_NAME in email_data.subject
+
+
+def test_render_email_templates_batch() -> None:
+    contexts = [
+        {"project_name": "LMS", "email": f"student{index}@example.com"}
+        for index in range(3)
+    ]
+    with patch.object(
+        email_templates, "get_template", wraps=email_templates.get_template
+    ) as get_template:
+        rendered = render_email_templates(
+            template_name="test_email.html", contexts=contexts
+        )
+    get_template.assert_called_once_with("test_email.html")
+    assert len(rendered) == 3
+    for index, html_content in enumerate(rendered):
+        assert f"student{index}@example.com" in html_content
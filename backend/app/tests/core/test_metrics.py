@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+WORKER = """
+from app.core import metrics
+metrics.REQUEST_DURATION.labels("items-read_items", "GET", "200").observe(0.01)
+metrics.REQUESTS_IN_PROGRESS.labels("GET").inc()
+"""
+
+SCRAPE = """
+from app.core import metrics
+print(metrics.render_latest()[0].decode())
+"""
+
+
+def run(code: str, multiproc_dir: Path) -> str:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def test_metrics_summed_across_workers(tmp_path: Path) -> None:
+    run(WORKER, tmp_path)
+    run(WORKER, tmp_path)
+    scraped = run(SCRAPE, tmp_path)
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="items-read_items",'
+        'status="200"} 2.0' in scraped
+    )
+    assert 'http_requests_in_progress{method="GET"} 2.0' in scraped
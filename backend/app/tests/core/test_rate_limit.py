@@ -0,0 +1,121 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi import Request
+from sqlmodel import Session
+
+from app.core.rate_limit import (
+    MemoryBackend,
+    check_rate_limit,
+    client_ip,
+    login_limit,
+)
+from app.crud import rate_limit_crud
+
+
+def test_memory_backend_allows_capacity_then_waits() -> None:
+    backend = MemoryBackend(max_keys=10)
+    assert [backend.take("key", 3, 1.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = backend.take("key", 3, 1.0)
+    assert 0 < wait <= 1.0
+
+
+def test_memory_backend_refills() -> None:
+    backend = MemoryBackend(max_keys=10)
+    with patch("app.core.rate_limit.time.monotonic", return_value=100.0):
+        backend.take("key", 1, 0.5)
+        assert backend.take("key", 1, 0.5) == 2.0
+    with patch("app.core.rate_limit.time.monotonic", return_value=102.0):
+        assert backend.take("key", 1, 0.5) == 0.0
+
+
+def test_memory_backend_evicts_least_recent() -> None:
+    backend = MemoryBackend(max_keys=2)
+    backend.take("a", 1, 0.01)
+    backend.take("b", 1, 0.01)
+    backend.take("c", 1, 0.01)
+    # a was dropped, so it starts over with a full bucket
+    assert backend.take("a", 1, 0.01) == 0.0
+    assert backend.take("c", 1, 0.01) > 0
+
+
+def test_postgres_take_token(db: Session) -> None:
+    key = f"test:{uuid.uuid4()}"
+
+    def take() -> float:
+        return rate_limit_crud.take_token(
+            session=db, key=key, capacity=2, refill_rate=0.1
+        )
+
+    assert take() == 0.0
+    assert take() == 0.0
+    wait = take()
+    assert 0 < wait <= 10.0
+    # A refused take spends nothing, the wait only shrinks
+    assert take() <= wait
+
+
+def test_postgres_prune_buckets(db: Session) -> None:
+    key = f"test:{uuid.uuid4()}"
+    rate_limit_crud.take_token(session=db, key=key, capacity=1, refill_rate=1.0)
+    assert rate_limit_crud.prune_buckets(session=db, idle_seconds=3600) == 0
+    assert rate_limit_crud.prune_buckets(session=db, idle_seconds=0) >= 1
+
+
+@pytest.mark.usefixtures("rate_limited")
+def test_check_rate_limit_per_email() -> None:
+    limit = login_limit()
+    for index in range(limit.per_email):
+        assert not check_rate_limit(
+            limit, client_ip=f"10.0.0.{index}", email="target@example.com"
+        )
+    # New IPs don't help once the email's bucket is empty, case doesn't either
+    assert check_rate_limit(limit, client_ip="10.0.1.1", email="Target@example.com")
+    assert not check_rate_limit(limit, client_ip="10.0.1.1", email="other@example.com")
+
+
+@pytest.mark.usefixtures("rate_limited")
+def test_check_rate_limit_per_ip() -> None:
+    limit = login_limit()
+    for index in range(limit.per_ip):
+        assert not check_rate_limit(
+            limit, client_ip="10.0.2.1", email=f"user{index}@example.com"
+        )
+    assert check_rate_limit(limit, client_ip="10.0.2.1", email="fresh@example.com")
+    assert not check_rate_limit(limit, client_ip="10.0.2.2", email="fresh@example.com")
+
+
+def test_check_rate_limit_disabled() -> None:
+    limit = login_limit()
+    for _ in range(limit.per_email + 1):
+        assert not check_rate_limit(limit, client_ip="10.0.3.1", email="a@example.com")
+
+
+def request_from(host: str, forwarded_for: str | None = None) -> Request:
+    headers = []
+    if forwarded_for is not None:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    return Request({"type": "http", "client": (host, 1234), "headers": headers})
+
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peer() -> None:
+    with patch("app.core.config.settings.TRUSTED_PROXIES", ["10.0.0.0/8"]):
+        assert client_ip(request_from("203.0.113.5", "198.51.100.1")) == "203.0.113.5"
+
+
+def test_client_ip_from_trusted_proxy() -> None:
+    with patch("app.core.config.settings.TRUSTED_PROXIES", ["10.0.0.0/8"]):
+        assert client_ip(request_from("10.0.0.2", "203.0.113.5")) == "203.0.113.5"
+        # Hops the client made up sit left of the one our proxy appended
+        request = request_from("10.0.0.2", "198.51.100.1, 203.0.113.5")
+        assert client_ip(request) == "203.0.113.5"
+        # Chained trusted proxies are skipped
+        request = request_from("10.0.0.2", "203.0.113.5, 10.0.0.9")
+        assert client_ip(request) == "203.0.113.5"
+        assert client_ip(request_from("10.0.0.2")) == "10.0.0.2"
+
+
+def test_client_ip_without_trusted_proxies() -> None:
+    with patch("app.core.config.settings.TRUSTED_PROXIES", []):
+        assert client_ip(request_from("10.0.0.2", "203.0.113.5")) == "10.0.0.2"
@@ -0,0 +1,46 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from app.core.replicas import ReplicaRouter
+
+
+def make_router(replicas: int = 2) -> ReplicaRouter:
+    return ReplicaRouter(
+        [MagicMock() for _ in range(replicas)],
+        max_lag=5.0,
+        lag_check_interval=10.0,
+        sticky_seconds=10.0,
+    )
+
+
+def test_choose_without_replicas_uses_primary() -> None:
+    router = make_router(replicas=0)
+    assert not router.enabled
+    assert router.choose(time.time()) is None
+
+
+def test_choose_round_robins_across_replicas() -> None:
+    router = make_router()
+    assert [router.choose() for _ in range(4)] == [0, 1, 0, 1]
+
+
+def test_lagging_replica_is_skipped() -> None:
+    router = make_router()
+    with patch.object(router, "measure_lag", side_effect=[30.0, 0.0]):
+        router.refresh_health()
+    assert [router.choose() for _ in range(3)] == [1, 1, 1]
+    assert not router.check_due
+
+
+def test_failed_lag_check_falls_back_to_primary() -> None:
+    router = make_router()
+    with patch.object(router, "measure_lag", side_effect=OSError("down")):
+        router.refresh_health()
+    assert router.choose() is None
+
+
+def test_client_reads_own_writes_from_primary() -> None:
+    router = make_router()
+    assert router.choose(time.time() - 1) is None
+    assert router.choose(time.time() - 60) is not None
+    assert router.choose(None) is not None
@@ -0,0 +1,15 @@
+import asyncio
+
+from app.core import security
+
+
+def test_password_hash_async_round_trip() -> None:
+    async def round_trip() -> tuple[bool, bool]:
+        hashed = await security.get_password_hash_async("secret-password")
+        return (
+            await security.verify_password_async("secret-password", hashed),
+            await security.verify_password_async("wrong-password", hashed),
+        )
+
+    assert asyncio.run(round_trip()) == (True, False)
+    assert security.hash_queue_depth() == 0
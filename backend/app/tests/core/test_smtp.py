@@ -0,0 +1,74 @@
+import time
+from email.message import EmailMessage
+from unittest.mock import patch
+
+import pytest
+
+from app.core.smtp import SMTPMailer, build_message
+from app.tests.utils.smtp import SMTPServer, smtp_server
+
+
+def message(index: int = 0) -> EmailMessage:
+    return build_message(
+        email_to=f"to{index}@example.com", subject="Hi", html_content="<p>Hi</p>"
+    )
+
+
+def test_build_message() -> None:
+    with (
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "admin@example.com"),
+        patch("app.core.config.settings.EMAILS_FROM_NAME", "LMS"),
+    ):
+        built = message()
+    assert built["From"] == "LMS <admin@example.com>"
+    assert built["To"] == "to0@example.com"
+    assert built.get_content_subtype() == "html"
+
+
+@pytest.mark.usefixtures("smtp_settings")
+def test_mailer_reuses_connection(server: SMTPServer) -> None:
+    mailer = SMTPMailer()
+    for index in range(20):
+        mailer.send(message(index))
+    mailer.close()
+    assert server.messages == 20
+    assert mailer.connections_opened == 1
+    assert server.connections == 1
+
+
+@pytest.mark.usefixtures("smtp_settings")
+def test_mailer_rotates_connection(server: SMTPServer) -> None:
+    mailer = SMTPMailer()
+    with patch("app.core.config.settings.SMTP_MAX_MESSAGES_PER_CONNECTION", 5):
+        for index in range(12):
+            mailer.send(message(index))
+    mailer.close()
+    assert server.messages == 12
+    assert mailer.connections_opened == 3
+
+
+@pytest.mark.usefixtures("smtp_settings")
+def test_mailer_reconnects_after_disconnect() -> None:
+    with (
+        smtp_server(drop_after=2) as dropping,
+        patch("app.core.config.settings.SMTP_PORT", dropping.server_address[1]),
+    ):
+        mailer = SMTPMailer()
+        for index in range(5):
+            mailer.send(message(index))
+        mailer.close()
+    assert dropping.messages == 5
+    assert mailer.connections_opened == 3
+
+
+@pytest.mark.usefixtures("smtp_settings")
+def test_mailer_rate_limit(server: SMTPServer) -> None:
+    mailer = SMTPMailer()
+    start = time.monotonic()
+    with patch("app.core.config.settings.SMTP_RATE_LIMIT", 50):
+        for index in range(6):
+            mailer.send(message(index))
+    mailer.close()
+    # The first message goes out immediately, the other five wait 20ms each
+    assert time.monotonic() - start >= 0.1
+    assert server.messages == 6
@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.sql_stats import (
+    RepeatedStatementError,
+    SQLStats,
+    check_repeats,
+    normalize_statement,
+)
+
+
+def test_normalize_statement_collapses_param_lists() -> None:
+    one = "SELECT * FROM item WHERE id IN (%(id_1_1)s)"
+    many = "SELECT *\n  FROM item WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)"
+    assert normalize_statement(one) == normalize_statement(many)
+
+
+def test_check_repeats_raises_in_strict_mode() -> None:
+    stats = SQLStats()
+    for _ in range(settings.SQL_REPEAT_THRESHOLD + 1):
+        stats.record("SELECT * FROM userprofile WHERE id = %(id_1)s", 0.001)
+    assert stats.count == settings.SQL_REPEAT_THRESHOLD + 1
+    with patch("app.core.sql_stats.raise_on_repeat", True):
+        with pytest.raises(RepeatedStatementError):
+            check_repeats(stats, "/contactus/")
+
+
+def test_server_timing_header(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.SQL_STATS_ENABLED", True):
+        r = client.get(f"{settings.API_V1_STR}/items/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    assert r.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_server_timing_header_disabled(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=superuser_token_headers)
+    assert "Server-Timing" not in r.headers
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from sqlmodel import Session, func, select
+
+from app.crud import enrollment_crud
+from app.models import CourseEnrollmentCounter
+from app.tests.utils.course import create_random_course
+
+
+def test_increments_spread_over_slots(db: Session) -> None:
+    course = create_random_course(db)
+    for _ in range(50):
+        enrollment_crud.increment_enrollment_counts(session=db, counts={course.id: 1})
+    db.commit()
+    statement = select(func.count(), func.sum(CourseEnrollmentCounter.count)).where(
+        CourseEnrollmentCounter.course_id == course.id
+    )
+    slots, total = db.exec(statement).one()
+    assert 1 < slots <= 16
+    assert total == 50
+
+
+def test_increments_share_one_slot(db: Session) -> None:
+    course = create_random_course(db)
+    with patch("app.core.config.settings.ENROLLMENT_COUNTER_SLOTS", 1):
+        enrollment_crud.increment_enrollment_counts(session=db, counts={course.id: 2})
+        enrollment_crud.increment_enrollment_counts(session=db, counts={course.id: 3})
+    db.commit()
+    counters = db.exec(
+        select(CourseEnrollmentCounter).where(
+            CourseEnrollmentCounter.course_id == course.id
+        )
+    ).all()
+    assert [counter.count for counter in counters] == [5]
+
+
+def test_fold_enrollment_counts(db: Session) -> None:
+    course = create_random_course(db)
+    other = create_random_course(db)
+    enrollment_crud.increment_enrollment_counts(
+        session=db, counts={course.id: 3, other.id: 1}
+    )
+    db.commit()
+    assert enrollment_crud.fold_enrollment_counts(session=db) >= 2
+    db.refresh(course)
+    db.refresh(other)
+    assert course.enrollment_count == 3
+    assert other.enrollment_count == 1
+    pending = db.exec(
+        select(CourseEnrollmentCounter).where(
+            CourseEnrollmentCounter.course_id == course.id
+        )
+    ).all()
+    assert pending == []
+
+
+def test_fold_negative_enrollment_counts(db: Session) -> None:
+    course = create_random_course(db)
+    enrollment_crud.increment_enrollment_counts(session=db, counts={course.id: 3})
+    db.commit()
+    enrollment_crud.fold_enrollment_counts(session=db)
+    enrollment_crud.increment_enrollment_counts(session=db, counts={course.id: -2})
+    db.commit()
+    enrollment_crud.fold_enrollment_counts(session=db)
+    db.refresh(course)
+    assert course.enrollment_count == 1
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, col, delete
+
+from app.core.db import engine
+from app.crud import user_item_crud
+from app.models import Item
+from app.tests.utils.item import create_random_item
+
+
+def test_get_item_owners_locks_rows_until_commit(db: Session) -> None:
+    item = create_random_item(db)
+    with Session(engine) as checking, Session(engine) as deleting:
+        owners = user_item_crud.get_item_owners(session=checking, ids=[item.id])
+        assert owners == {item.id: item.owner_id}
+        # The row can't go away between the permission check and the update
+        deleting.execute(text("SET LOCAL lock_timeout = '100ms'"))
+        with pytest.raises(OperationalError):
+            deleting.exec(delete(Item).where(col(Item.id) == item.id))  # type: ignore
+        deleting.rollback()
+        checking.commit()
+        deleting.exec(delete(Item).where(col(Item.id) == item.id))  # type: ignore
+        deleting.commit()
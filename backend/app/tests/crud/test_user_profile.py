@@ -0,0 +1,143 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+from unittest.mock import patch
+
+from passlib.context import CryptContext
+from passlib.hash import bcrypt
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine
+from app.core.security import verify_password
+from app.crud import async_user_profile_crud, user_profile_crud
+from app.models import UserProfile
+from app.tests.utils.user_profile import random_gmail
+from app.tests.utils.utils import random_lower_string
+
+T = TypeVar("T")
+
+
+def run(func: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    async def with_session() -> T:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await func(session)
+
+    return asyncio.run(with_session())
+
+
+def legacy_user_profile(db: Session, password: str) -> UserProfile:
+    user_profile = UserProfile(
+        full_name=random_lower_string(), email=random_gmail(), password=password
+    )
+    return user_profile_crud.create_user_profile(session=db, user=user_profile)
+
+
+def test_set_password_hashes() -> None:
+    user_profile = UserProfile(full_name=random_lower_string(), email=random_gmail())
+    asyncio.run(
+        async_user_profile_crud.set_password(user=user_profile, password="secretpass")
+    )
+    assert user_profile.password is None
+    assert user_profile.hashed_password
+    assert verify_password("secretpass", user_profile.hashed_password)
+
+
+def test_authenticate_user_profile(db: Session) -> None:
+    user_profile = UserProfile(full_name=random_lower_string(), email=random_gmail())
+    asyncio.run(
+        async_user_profile_crud.set_password(user=user_profile, password="secretpass")
+    )
+    user_profile_crud.create_user_profile(session=db, user=user_profile)
+    assert run(
+        lambda session: async_user_profile_crud.authenticate_user(
+            session=session, email=user_profile.email, password="secretpass"
+        )
+    )
+    assert not run(
+        lambda session: async_user_profile_crud.authenticate_user(
+            session=session, email=user_profile.email, password="wrongpass"
+        )
+    )
+
+
+def verify(user_profile: UserProfile, password: str) -> bool:
+    async def verify_in(session: AsyncSession) -> bool:
+        user = await async_user_profile_crud.get_user_profile_by_id(
+            session=session, id=user_profile.id
+        )
+        assert user
+        return await async_user_profile_crud.verify_user_password(
+            session=session, user=user, password=password
+        )
+
+    return run(verify_in)
+
+
+def test_legacy_password_hashed_on_sign_in(db: Session) -> None:
+    user_profile = legacy_user_profile(db, "plainpass")
+    assert not verify(user_profile, "wrongpass")
+    db.refresh(user_profile)
+    assert user_profile.hashed_password is None
+    assert verify(user_profile, "plainpass")
+    db.refresh(user_profile)
+    assert user_profile.password is None
+    assert user_profile.hashed_password
+    assert verify_password("plainpass", user_profile.hashed_password)
+
+
+def test_outdated_hash_rehashed_on_sign_in(db: Session) -> None:
+    weak_hash = bcrypt.using(rounds=4).hash("secretpass")
+    user_profile = UserProfile(
+        full_name=random_lower_string(), email=random_gmail(), hashed_password=weak_hash
+    )
+    user_profile_crud.create_user_profile(session=db, user=user_profile)
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__min_rounds=12)
+    with patch("app.core.security.pwd_context", context):
+        assert verify(user_profile, "secretpass")
+    db.refresh(user_profile)
+    assert user_profile.hashed_password
+    assert user_profile.hashed_password != weak_hash
+    assert not context.needs_update(user_profile.hashed_password)
+
+
+def hash_batch(batch_size: int) -> int:
+    return run(
+        lambda session: async_user_profile_crud.hash_plaintext_passwords(
+            session=session, batch_size=batch_size
+        )
+    )
+
+
+def test_hash_plaintext_passwords_in_batches(db: Session) -> None:
+    user_profiles = [legacy_user_profile(db, f"plainpass{i}") for i in range(3)]
+    while hash_batch(2):
+        pass
+    for index, user_profile in enumerate(user_profiles):
+        db.refresh(user_profile)
+        assert user_profile.password is None
+        assert user_profile.hashed_password
+        assert verify_password(f"plainpass{index}", user_profile.hashed_password)
+
+
+def test_hash_plaintext_passwords_skips_changed_rows(db: Session) -> None:
+    # Leave this profile as the only plaintext row
+    while hash_batch(100):
+        pass
+    user_profile = legacy_user_profile(db, "plainpass")
+
+    async def changed_while_hashing(_password: str) -> str:
+        # The password is changed after the select and before the update
+        user_profile.password = "newpass"
+        db.add(user_profile)
+        db.commit()
+        return "not-the-hash"
+
+    with patch(
+        "app.crud.async_user_profile_crud.get_password_hash_async",
+        changed_while_hashing,
+    ):
+        assert hash_batch(100) == 0
+    db.refresh(user_profile)
+    assert user_profile.password == "newpass"
+    assert user_profile.hashed_password is None
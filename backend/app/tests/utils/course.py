@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+from sqlmodel import Session
+
+from app.models import (
+    Author,
+    Course,
+    CourseAuthorLink,
+    CourseChapter,
+    CourseResource,
+    Price,
+    ResourceType,
+)
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_course(db: Session, chapters: int = 1) -> Course:
+    course = Course(
+        course_name=random_lower_string(), description=random_lower_string()
+    )
+    author = Author(name=random_lower_string())
+    resource_type = ResourceType(type_name=random_lower_string())
+    db.add_all([course, author, resource_type])
+    db.flush()
+    db.add(CourseAuthorLink(course_id=course.id, author_id=author.id))
+    db.add(Price(amount=Decimal("49.99"), course_id=course.id))
+    add_chapters(db, course, resource_type, chapters)
+    db.commit()
+    db.refresh(course)
+    return course
+
+
+def add_chapters(
+    db: Session, course: Course, resource_type: ResourceType, chapters: int
+) -> None:
+    for _ in range(chapters):
+        chapter = CourseChapter(title=random_lower_string(), course_id=course.id)
+        db.add(chapter)
+        db.flush()
+        db.add(
+            CourseResource(
+                title=random_lower_string(),
+                course_id=course.id,
+                chapter_id=chapter.id,
+                resource_type_id=resource_type.id,
+            )
+        )
@@ -0,0 +1,60 @@
+import socketserver
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server: SMTPServer = self.server  # type: ignore[assignment]
+        server.connections += 1
+        self.reply("220 localhost test server")
+        while line := self.rfile.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                server.messages += 1
+                self.reply("250 queued")
+                if server.drop_after and server.messages % server.drop_after == 0:
+                    return
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    """
+    Accepts every message and counts connections, for testing the mailer.
+
+    With drop_after set, the connection is closed after that many messages.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, drop_after: int = 0) -> None:
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.drop_after = drop_after
+        self.connections = 0
+        self.messages = 0
+
+
+@contextmanager
+def smtp_server(drop_after: int = 0) -> Generator[SMTPServer, None, None]:
+    server = SMTPServer(drop_after=drop_after)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
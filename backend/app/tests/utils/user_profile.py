@@ -0,0 +1,33 @@
+from sqlmodel import Session
+
+from app.core.security import get_password_hash
+from app.crud import user_profile_crud
+from app.models import ContactMessage, UserProfile
+from app.tests.utils.utils import random_lower_string
+
+
+def random_gmail() -> str:
+    # userprofile.email is limited to 64 characters and sign up requires gmail.com
+    return f"{random_lower_string()[:16]}@gmail.com"
+
+
+def create_random_user_profile(db: Session) -> UserProfile:
+    user_profile = UserProfile(
+        full_name=random_lower_string(),
+        last_name=random_lower_string()[:16],
+        email=random_gmail(),
+        hashed_password=get_password_hash(random_lower_string()[:16]),
+    )
+    return user_profile_crud.create_user_profile(session=db, user=user_profile)
+
+
+def create_random_contact_message(
+    db: Session, user_profile: UserProfile
+) -> ContactMessage:
+    message = ContactMessage(
+        message=random_lower_string(), user_profile_id=user_profile.id
+    )
+    db.add(message)
+    db.commit()
+    db.refresh(message)
+    return message
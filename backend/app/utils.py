@@ -1,15 +1,19 @@
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import emails  # type: ignore
 import jwt
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from jwt.exceptions import InvalidTokenError
+from sqlmodel import Session
 
 from app.core.config import settings
+from app.core.db import engine
+from app.core.smtp import build_message, mailer
+from app.crud import email_crud
 
 
 @dataclass
@@ -18,37 +22,80 @@ class EmailData:
     subject: str
 
 
+# Templates are compiled once per worker, and the bytecode is shared on disk so
+# new workers skip compiling them. Files are only re-checked when developing.
+email_templates = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "email-templates" / "build"),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=settings.ENVIRONMENT == "local",
+)
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
+    html_content = email_templates.get_template(template_name).render(context)
     return html_content
 
 
+def render_email_templates(
+    *, template_name: str, contexts: Iterable[dict[str, Any]]
+) -> list[str]:
+    """
+    Render one template once per context, e.g. for each recipient of a bulk email.
+    """
+    template = email_templates.get_template(template_name)
+    return [template.render(context) for context in contexts]
+
+
 def send_email(
     *,
     email_to: str,
     subject: str = "",
     html_content: str = "",
 ) -> None:
+    """
+    Queue an email for the background sender and return without touching SMTP.
+    """
     assert settings.emails_enabled, "no provided configuration for email variables"
-    message = emails.Message(
-        subject=subject,
-        html=html_content,
-        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+    with Session(engine) as session:
+        email = email_crud.enqueue_email(
+            session=session,
+            email_to=email_to,
+            subject=subject,
+            html_content=html_content,
+        )
+        logging.info(f"queued email {email.id}")
+
+
+def send_emails(messages: list[tuple[str, EmailData]]) -> int:
+    """
+    Queue one email per (email_to, EmailData) pair with a single insert.
+    """
+    assert settings.emails_enabled, "no provided configuration for email variables"
+    with Session(engine) as session:
+        queued = email_crud.enqueue_emails(
+            session=session,
+            emails=[
+                (email_to, data.subject, data.html_content)
+                for email_to, data in messages
+            ],
+        )
+    logging.info(f"queued {queued} emails")
+    return queued
+
+
+def deliver_email(
+    *,
+    email_to: str,
+    subject: str = "",
+    html_content: str = "",
+) -> None:
+    """
+    Send an email over this worker's pooled SMTP session, raising on failure.
+    """
+    message = build_message(
+        email_to=email_to, subject=subject, html_content=html_content
     )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
-    logging.info(f"send email result: {response}")
+    mailer.send(message)
 
 
 def generate_test_email(email_to: str) -> EmailData:
@@ -78,9 +125,7 @@ def generate_reset_password_email(email_to: str, email: str, token: str) -> Emai
     return EmailData(html_content=html_content, subject=subject)
 
 
-def generate_new_account_email(
-    email_to: str, username: str, password: str
-) -> EmailData:
+def generate_new_account_email(email_to: str, username: str) -> EmailData:
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - New account for user {username}"
     html_content = render_email_template(
@@ -88,7 +133,6 @@ def generate_new_account_email(
         context={
             "project_name": settings.PROJECT_NAME,
             "username": username,
-            "password": password,
             "email": email_to,
             "link": settings.server_host,
         },
@@ -96,6 +140,33 @@ def generate_new_account_email(
     return EmailData(html_content=html_content, subject=subject)
 
 
+def generate_course_announcement_emails(
+    *, course_name: str, learners: list[tuple[str, str]], subject: str, message: str
+) -> list[tuple[str, EmailData]]:
+    """
+    One announcement per (email, full_name) learner, the template is looked up once.
+    """
+    project_name = settings.PROJECT_NAME
+    html_contents = render_email_templates(
+        template_name="course_announcement.html",
+        contexts=(
+            {
+                "project_name": project_name,
+                "course_name": course_name,
+                "full_name": full_name,
+                "email": email,
+                "message": message,
+            }
+            for email, full_name in learners
+        ),
+    )
+    subject = f"{project_name} - {course_name}: {subject}"
+    return [
+        (email, EmailData(html_content=html_content, subject=subject))
+        for (email, _), html_content in zip(learners, html_contents, strict=True)
+    ]
+
+
 def generate_password_reset_token(email: str) -> str:
     delta = timedelta(hours=settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS)
     now = datetime.now(timezone.utc)
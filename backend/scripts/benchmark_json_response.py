@@ -0,0 +1,117 @@
+"""
+Compare the time from a route's return value to response bytes on 1k-row pages.
+
+Routes returning a UsersPublic or ItemsPublic model go through response_model
+validation and jsonable_encoder before the response class renders the result.
+The list routes skip both by returning PydanticJSONResponse(model), which
+serializes the model in one pydantic-core call. Timed here:
+
+    response_model + JSONResponse          the stdlib path before
+    response_model + PydanticJSONResponse  only the final encode swapped
+    PydanticJSONResponse(model)            what read_users and read_items do
+
+    python scripts/benchmark_json_response.py [rows] [repeat]
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.api.responses import PydanticJSONResponse
+from app.models import Item, ItemsPublic, User, UsersPublic
+
+
+def pages(rows: int) -> list[BaseModel]:
+    users = UsersPublic(
+        data=[
+            User(
+                id=uuid.uuid4(),
+                email=f"user{i}@example.com",
+                full_name=f"User Number {i}",
+                hashed_password="x" * 60,
+            )
+            for i in range(rows)
+        ],
+        count=rows,
+    )
+    items = ItemsPublic(
+        data=[
+            Item(
+                id=uuid.uuid4(),
+                owner_id=uuid.uuid4(),
+                title=f"Item {i}",
+                description="x" * 120,
+            )
+            for i in range(rows)
+        ],
+        count=rows,
+    )
+    return [users, items]
+
+
+def through_response_model(
+    model: BaseModel, response_class: type[JSONResponse]
+) -> Callable[[], Any]:
+    field = create_response_field("Response", type(model))
+
+    async def render() -> Response:
+        content = await serialize_response(field=field, response_content=model)
+        return response_class(content)
+
+    return render
+
+
+def direct(model: BaseModel) -> Callable[[], Any]:
+    async def render() -> Response:
+        return PydanticJSONResponse(model)
+
+    return render
+
+
+async def best_of(render: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            await render()
+        timings.append(time.perf_counter() - start)
+    return min(timings) / repeat
+
+
+async def run(rows: int, repeat: int) -> None:
+    for model in pages(rows):
+        variants = {
+            "response_model + JSONResponse": through_response_model(
+                model, JSONResponse
+            ),
+            "response_model + PydanticJSONResponse": through_response_model(
+                model, PydanticJSONResponse
+            ),
+            "PydanticJSONResponse(model)": direct(model),
+        }
+        bodies = {(await render()).body for render in variants.values()}
+        assert len(bodies) == 1, "variants rendered different bodies"
+        for label, render in variants.items():
+            seconds = await best_of(render, repeat)
+            print(
+                f"{type(model).__name__} x{rows} {label:>38}: "
+                f"{seconds * 1000:.3f} ms"
+            )
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(run(rows, repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Gunicorn settings, copied to /app where the base image's start script finds it.
+
+Keeps the image's defaults and adds what Prometheus multiprocess mode needs:
+a shared directory for worker samples, emptied on start, and dropping a dead
+worker's live gauges so in-flight and pool numbers stay correct.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+BASE_CONF = Path("/gunicorn_conf.py")
+
+if BASE_CONF.exists():
+    exec(compile(BASE_CONF.read_text(), str(BASE_CONF), "exec"))
+
+# Set before workers import the app, prometheus-client reads it at import time
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus")
+
+
+def on_starting(_server: Any) -> None:
+    # Samples left by a previous run would be summed into the new one
+    multiproc_dir = Path(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    multiproc_dir.mkdir(parents=True)
+
+
+def child_exit(_server: Any, worker: Any) -> None:
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)